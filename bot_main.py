@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+import os
+import sys
+import logging
+from telegram import Update
+from telegram.ext import Updater, CommandHandler, MessageHandler, Filters, CallbackContext
+
+from config.config import TELEGRAM_BOT_TOKEN
+
+# Configure logging unless the importing process already has
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=logging.INFO
+    )
+logger = logging.getLogger(__name__)
+
+# LOG_LEVEL=WARNING skips the per-message INFO lines in production
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+try:
+    logger.setLevel(LOG_LEVEL)
+except ValueError:
+    logger.setLevel(logging.INFO)
+    logger.warning("Unknown LOG_LEVEL '%s'; using INFO", LOG_LEVEL)
+
+# Plain text messages that aren't commands; built once at import
+TEXT_MESSAGE_FILTER = Filters.text & ~Filters.command
+
+# Port the webhook server listens on when started with --webhook
+WEBHOOK_PORT = 8443
+
+def get_webhook_url():
+    """
+    Return the public base URL passed with --webhook, or None to use polling.
+    Exits with a usage error when --webhook is given without a URL.
+    """
+    if '--webhook' in sys.argv:
+        index = sys.argv.index('--webhook') + 1
+        if index < len(sys.argv) and not sys.argv[index].startswith('-'):
+            return sys.argv[index].rstrip('/')
+        sys.exit(f"usage: {os.path.basename(sys.argv[0])} [--webhook https://your-public-host]")
+    return None
+
+def get_id_command(update: Update, context: CallbackContext):
+    """Send the chat ID when the command /getchatid is issued."""
+    chat_id = update.effective_chat.id
+    update.message.reply_text(f"This chat's ID is: {chat_id}")
+    logger.info("Chat ID request from %s: %s", update.effective_user.username, chat_id)
+
+def echo(update: Update, context: CallbackContext):
+    """Echo the user message and show chat ID."""
+    chat_id = update.effective_chat.id
+    chat_type = update.effective_chat.type
+    username = update.effective_user.username
+    
+    # Log the information
+    logger.info("Message from %s in %s chat with ID: %s", username, chat_type, chat_id)
+    
+    # Reply with the chat ID
+    update.message.reply_text(f"This chat's ID is: {chat_id}\nChat type: {chat_type}")
+
+def run_bot(handlers, startup_messages):
+    """
+    Start a single Updater serving the given handlers until Ctrl+C.
+    
+    Args:
+        handlers (list): Handlers to register on the dispatcher
+        startup_messages (list): Lines to log once the bot is running
+    """
+    # The token is read once from the environment by config.config
+    token = TELEGRAM_BOT_TOKEN
+    
+    if not token:
+        logger.error("No bot token found. Please set TELEGRAM_BOT_TOKEN in your .env file.")
+        return
+    
+    # One Updater means one connection pool, reused by every long poll and reply
+    updater = Updater(token, request_kwargs={'read_timeout': 25, 'connect_timeout': 10})
+    
+    # Get the dispatcher to register handlers; handlers registered with
+    # run_async=True reply from the worker pool while the next batch of
+    # updates is already being fetched
+    dispatcher = updater.dispatcher
+    for handler in handlers:
+        dispatcher.add_handler(handler)
+    
+    # Start the Bot; only message updates are needed
+    webhook_url = get_webhook_url()
+    if webhook_url:
+        # Let Telegram push updates instead of polling for them
+        updater.start_webhook(
+            listen="0.0.0.0",
+            port=WEBHOOK_PORT,
+            url_path=token,
+            webhook_url=f"{webhook_url}/{token}",
+            allowed_updates=["message"]
+        )
+        logger.info("Receiving updates via webhook at %s", webhook_url)
+    else:
+        # Long polling is the default for local development
+        updater.start_polling(
+            poll_interval=0.0,
+            timeout=20,
+            read_latency=2.0,
+            allowed_updates=["message"]
+        )
+    
+    for message in startup_messages:
+        logger.info(message)
+    logger.info("Press Ctrl+C to stop.")
+    
+    # Run the bot until you press Ctrl-C
+    updater.idle()
+
+def main():
+    """Start one bot that answers both /getchatid and plain messages with the chat ID."""
+    run_bot(
+        [
+            CommandHandler("getchatid", get_id_command, run_async=True),
+            MessageHandler(TEXT_MESSAGE_FILTER, echo, run_async=True)
+        ],
+        [
+            "Bot started. Use /getchatid or send any message to get the chat ID.",
+            "Add it to a group or send it a direct message."
+        ]
+    )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+import os
+from dotenv import dotenv_values
+
+# Paths relative to this script
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ENV_FILE = os.path.join(BASE_DIR, '.env')
+OUTPUT_FILE = os.path.join(BASE_DIR, 'config', '_env_compiled.py')
+
+def main():
+    """Compile .env into config/_env_compiled.py so config.py can skip parsing it."""
+    if not os.path.exists(ENV_FILE):
+        print(f"No .env file found at {ENV_FILE}")
+        return
+    
+    # Parse the .env file once, here, instead of on every start
+    values = {key: value for key, value in dotenv_values(ENV_FILE).items() if value is not None}
+    
+    lines = [
+        "# Generated by compile_env.py from .env - do not edit or commit.",
+        "ENV = {",
+    ]
+    lines += [f"    {key!r}: {value!r}," for key, value in values.items()]
+    lines.append("}")
+    
+    with open(OUTPUT_FILE, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    
+    print(f"Wrote {len(values)} variables to {OUTPUT_FILE}")
+    print("Re-run this script whenever .env changes.")
+
+if __name__ == '__main__':
+    main()
@@ -1,35 +1,71 @@
 import os
-import pytz
-from dotenv import load_dotenv
+from types import MappingProxyType
 
-# Load environment variables from .env file
-load_dotenv()
-
-# Telegram Bot Configuration
-TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
-TELEGRAM_GROUP_CHAT_ID = os.getenv('TELEGRAM_GROUP_CHAT_ID')
-
-# Google Sheets Configuration
-GOOGLE_SHEET_ID = os.getenv('GOOGLE_SHEET_ID')
-GOOGLE_SERVICE_ACCOUNT_FILE = os.getenv('GOOGLE_SERVICE_ACCOUNT_FILE')
+# Settings read from the environment; loaded lazily by __getattr__ below
+ENV_SETTINGS = (
+    # Telegram Bot Configuration
+    'TELEGRAM_BOT_TOKEN',
+    'TELEGRAM_GROUP_CHAT_ID',
+    # Google Sheets Configuration
+    'GOOGLE_SHEET_ID',
+    'GOOGLE_SERVICE_ACCOUNT_FILE',
+)
 
 # Timezone Configuration
-IST_TIMEZONE = pytz.timezone('Asia/Kolkata')
+IST_TIMEZONE_NAME = 'Asia/Kolkata'
 
 # Sheet Tab Names
 TASK_LOG_SHEET = 'Task_Log'
 OKR_LOG_SHEET = 'OKR_Log'
 DAILY_PROGRESS_LOG_SHEET = 'Daily_Progress_Log'
 
-# Task Priorities
-TASK_PRIORITIES = {
+# Task Priorities (read-only)
+TASK_PRIORITIES = MappingProxyType({
     'P1': '🔴',  # High priority
     'P2': '🟡',  # Medium priority
     'P3': '🔵',  # Low priority
-}
+})
+
+# Scheduled Message Times as (hour, minute) in 24-hour format, IST
+DAILY_PLANNING_TIME = (10, 0)
+DAILY_NUDGE_TIME = (11, 0)
+MIDDAY_CHECK_TIME = (15, 0)
+EOD_SUMMARY_TIME = (19, 0)
+
+_env_loaded = False
+
+def _load_env():
+    """Load .env into os.environ once, preferring the module compiled by compile_env.py."""
+    global _env_loaded
+    if _env_loaded:
+        return
+
+    try:
+        from ._env_compiled import ENV as compiled_env
+    except ImportError:
+        from dotenv import load_dotenv
+        load_dotenv()
+    else:
+        # Like load_dotenv, never override variables already set in the environment
+        for key, value in compiled_env.items():
+            os.environ.setdefault(key, value)
+
+    _env_loaded = True
+
+def __getattr__(name):
+    """
+    Resolve environment settings and IST_TIMEZONE on first access (PEP 562),
+    so importing this module stays cheap.
+    """
+    if name in ENV_SETTINGS:
+        _load_env()
+        value = os.getenv(name)
+    elif name == 'IST_TIMEZONE':
+        from zoneinfo import ZoneInfo
+        value = ZoneInfo(IST_TIMEZONE_NAME)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Scheduled Message Times (in 24-hour format, IST)
-DAILY_PLANNING_TIME = '10:00'
-DAILY_NUDGE_TIME = '11:00'
-MIDDAY_CHECK_TIME = '15:00'
-EOD_SUMMARY_TIME = '19:00'
+    # Cache the value so later lookups skip this function
+    globals()[name] = value
+    return value
@@ -1,41 +1,92 @@
 #!/usr/bin/env python3
 import os
+import sys
 import requests
 import json
-from dotenv import load_dotenv
+
+# orjson is optional; it decodes and pretty-prints large update batches
+# much faster than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from config.config import TELEGRAM_BOT_TOKEN
+
+# Long-poll timeout in seconds; Telegram holds the request open until an
+# update arrives or this many seconds pass.
+LONG_POLL_TIMEOUT = 20
+
+# File next to this script that stores the next update offset to request
+OFFSET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.last_update_id')
+
+def load_offset():
+    """Return the next update offset saved by a previous run, or None."""
+    try:
+        with open(OFFSET_FILE) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+def save_offset(offset):
+    """Save the next update offset so the next run skips seen updates."""
+    with open(OFFSET_FILE, 'w') as f:
+        f.write(str(offset))
 
 def main():
-    # Load environment variables
-    load_dotenv()
-    
-    # Get the bot token from environment variable
-    token = os.getenv('TELEGRAM_BOT_TOKEN')
+    # The token is read once from the environment by config.config
+    token = TELEGRAM_BOT_TOKEN
     
     if not token:
         print("No bot token found. Please set TELEGRAM_BOT_TOKEN in your .env file.")
         return
     
-    # Make a request to the Telegram API
+    # Make a long-polling request to the Telegram API
     url = f"https://api.telegram.org/bot{token}/getUpdates"
-    response = requests.get(url)
+    params = {
+        'timeout': LONG_POLL_TIMEOUT,
+        'limit': 100,
+        'allowed_updates': json.dumps(["message"])
+    }
+    
+    # Acknowledge updates seen by earlier runs so they aren't sent again
+    offset = load_offset()
+    if offset is not None:
+        params['offset'] = offset
+    
+    print(f"Waiting up to {LONG_POLL_TIMEOUT}s for updates...")
+    with requests.Session() as session:
+        # Read timeout must outlast the long-poll window
+        response = session.get(url, params=params, timeout=LONG_POLL_TIMEOUT + 5)
     
     # Parse the response
-    data = response.json()
+    data = orjson.loads(response.content) if orjson else response.json()
     
-    # Pretty print the response
-    print(json.dumps(data, indent=2))
+    # Pretty print the response unless only the chat IDs were asked for;
+    # --ids-only skips building a second, indented copy of the payload
+    if '--ids-only' not in sys.argv:
+        if orjson:
+            sys.stdout.flush()
+            sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n")
+            sys.stdout.buffer.flush()
+        else:
+            print(json.dumps(data, indent=2))
     
     # Check if there are any updates
     if data['ok'] and data['result']:
-        print("\n--- Chat IDs found ---")
-        for update in data['result']:
-            if 'message' in update and 'chat' in update['message']:
-                chat = update['message']['chat']
-                chat_id = chat['id']
-                chat_type = chat['type']
-                chat_title = chat.get('title', 'Private Chat')
-                print(f"Chat ID: {chat_id}, Type: {chat_type}, Title: {chat_title}")
+        save_offset(max(update['update_id'] for update in data['result']) + 1)
+        
+        # Build all lines first and write them in one call
+        lines = ["\n--- Chat IDs found ---"]
+        lines += [
+            f"Chat ID: {chat['id']}, Type: {chat['type']}, Title: {chat.get('title', 'Private Chat')}"
+            for update in data['result']
+            if (chat := update.get('message', {}).get('chat'))
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
     else:
+        if offset is not None:
+            print(f"\nUpdates shown by earlier runs are skipped. Delete {OFFSET_FILE} to see them again.")
         print("\nNo updates found. Make sure to:")
         print("1. Add your bot to the group")
         print("2. Send some messages in the group")
@@ -1,13 +1,24 @@
+import functools
 import logging
-import re
+import random
+import threading
+import time
+import tracemalloc
 from datetime import datetime
-from telegram import Update, ParseMode, InlineKeyboardMarkup, InlineKeyboardButton
+from urllib.parse import urlparse
+from telegram import Update, ParseMode, InlineKeyboardMarkup, InlineKeyboardButton, BotCommand
+from telegram.constants import MAX_MESSAGE_LENGTH
+from telegram.error import RetryAfter, TelegramError
+from telegram.utils.helpers import escape_markdown
 from telegram.ext import (
     Updater, CommandHandler, CallbackContext, 
-    CallbackQueryHandler, MessageHandler, Filters
+    CallbackQueryHandler, MessageHandler, Filters, ConversationHandler,
+    PicklePersistence
 )
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 import os
 from dotenv import load_dotenv
@@ -19,15 +30,108 @@ load_dotenv()
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 TELEGRAM_GROUP_CHAT_ID = os.getenv('TELEGRAM_GROUP_CHAT_ID')
 
-# Import timezone and time constants
+# How updates are received: 'polling' (default) or 'webhook'
+BOT_MODE = os.getenv('MODE', 'polling').lower()
+WEBHOOK_URL = os.getenv('WEBHOOK_URL')
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', TELEGRAM_BOT_TOKEN)
+WEBHOOK_LISTEN = os.getenv('WEBHOOK_LISTEN', '0.0.0.0')
+# Left as text here; main.py checks it is a port number and start() parses it
+PORT = os.getenv('PORT', '8443')
+
+# Number of worker threads that run handlers concurrently
+HANDLER_WORKERS = 16
+
+# Threads for scheduled jobs; one per job, since each runs once a day
+SCHEDULER_WORKERS = 4
+
+# Size of the bot's pooled HTTPS connections to the Telegram API. It has room
+# for every handler worker, the scheduler's job threads and the updater's
+# own getUpdates connections, so connections are reused rather than re-opened
+CONNECTION_POOL_SIZE = HANDLER_WORKERS + SCHEDULER_WORKERS + 4
+
+# Long-poll timeout in seconds and the only update types the bot handles
+POLLING_TIMEOUT = 50
+ALLOWED_UPDATES = ["message", "callback_query"]
+
+# File where open conversations and user_data survive bot restarts
+STATE_FILE = os.getenv('BOT_STATE_FILE', 'bot_state.pkl')
+
+# Team members nudged when they haven't added tasks for the day. The bot
+# doesn't look up group members, so the team is listed here
+TEAM_USERNAMES = ('Sethu_Raman_O', 'audaciousSneha')
+
+# Conversation states for the completion link and OKR value prompts
+AWAIT_LINK, AWAIT_OKR_VALUE = range(2)
+
+# Translation table that removes Markdown bold markers, for messages sent as plain text
+STRIP_BOLD = str.maketrans('', '', '*')
+
+# Times a message is tried when Telegram answers with a flood limit
+SEND_ATTEMPTS = 5
+
+# Minimum seconds between bot messages to the group; Telegram allows about
+# 20 messages a minute per group
+GROUP_MESSAGE_INTERVAL = 3.0
+
+# Handlers and scheduled jobs slower than this many seconds are logged
+SLOW_CALL_THRESHOLD = 0.5
+
+# Set DEBUG_MEM=1 to log the biggest memory growth every MEMORY_SNAPSHOT_INTERVAL minutes
+DEBUG_MEM = os.getenv('DEBUG_MEM') == '1'
+MEMORY_SNAPSHOT_INTERVAL = 5
+
+# Seconds before an unanswered link/OKR prompt is dropped
+CONVERSATION_TIMEOUT = 30 * 60
+
+# Reply to /start
+START_TEXT = (
+    "👋 Hello! I'm your startup accountability partner. "
+    "I'll help you track tasks and OKRs. "
+    "Type /help to see what I can do."
+)
+
+# Reply to /help
+HELP_TEXT = (
+    "*InternBot - Your Startup Accountability Partner*\n\n"
+    "*Commands:*\n"
+    "• `/task [Priority] [Description] -c [Category] -d [YYYY-MM-DD] -a [Assignee]` - Add a new task\n"
+    "  Priority must be P1 (High), P2 (Medium), or P3 (Low)\n"
+    "  Category is optional (default: General)\n"
+    "  Due date is optional in YYYY-MM-DD format\n"
+    "  Assignee is optional (default: yourself)\n"
+    "  Example: `/task P1 Draft investor email -c Partnerships -d 2025-07-05 -a teammate`\n\n"
+    "• `/mytasks` - View your open tasks\n\n"
+    "• `/alltasks` - View all team members' tasks\n\n"
+    "• `/duetasks` - View tasks sorted by due date\n\n"
+    "• `/syncokrs` - Sync OKRs from the Google Sheet\n\n"
+    "*Task Completion:*\n"
+    "When marking a task as done, you'll be prompted to provide a link to your completed work (document, presentation, etc.).\n"
+    "This helps with accountability and makes it easier for the team to review your work.\n\n"
+    "*Daily Schedule (IST):*\n"
+    "• *10:00 AM* - Daily planning reminder\n"
+    "• *11:00 AM* - Nudge for missing tasks\n"
+    "• *3:00 PM* - Mid-day progress check\n"
+    "• *7:00 PM* - End-of-day summary and OKR updates"
+)
+
+# Import timezone and time constants; the scheduled times live in
+# config/config.py, in the project root next to src/
 import pytz
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.config import DAILY_PLANNING_TIME, DAILY_NUDGE_TIME, MIDDAY_CHECK_TIME, EOD_SUMMARY_TIME
 IST_TIMEZONE = pytz.timezone('Asia/Kolkata')
 
-# Define scheduled times
-DAILY_PLANNING_TIME = '10:00'
-DAILY_NUDGE_TIME = '11:00'
-MIDDAY_CHECK_TIME = '15:00'
-EOD_SUMMARY_TIME = '19:00'
+# Cron triggers for the scheduled jobs, keyed by job id and built once at import
+SCHEDULE_TRIGGERS = {
+    job_id: CronTrigger(hour=hour, minute=minute, timezone=IST_TIMEZONE)
+    for job_id, (hour, minute) in (
+        ('daily_planning', DAILY_PLANNING_TIME),
+        ('daily_nudge', DAILY_NUDGE_TIME),
+        ('midday_checkin', MIDDAY_CHECK_TIME),
+        ('eod_summary', EOD_SUMMARY_TIME)
+    )
+}
 from sheets_manager import SheetsManager
 from task_manager import TaskManager
 from okr_manager import OKRManager
@@ -39,10 +143,107 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _safe_handler(label):
+    """
+    Wrap a command handler so any error is logged and reported to the user.
+    
+    Args:
+        label (str): Start of the error reply, e.g. "Error retrieving all tasks"
+    
+    Returns:
+        function: Decorator for InternBot handler methods
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(self, update, context):
+            try:
+                return handler(self, update, context)
+            except Exception as e:
+                logger.exception("Error in %s", handler.__name__)
+                update.message.reply_text(f"{label}: {e}")
+        return wrapper
+    return decorator
+
+@functools.lru_cache(maxsize=1024)
+def _done_prompt_keyboard(task_id):
+    """
+    Build the keyboard asking how to complete a task; cached per task ID.
+    
+    Args:
+        task_id (str): ID of the task being completed
+    
+    Returns:
+        InlineKeyboardMarkup: "no link" and "add link" buttons for the task
+    """
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("✅ Mark as Done (No Link)", callback_data=f"nolink:{task_id}")],
+        [InlineKeyboardButton("📎 Add Link to Completed Work", callback_data=f"addlink:{task_id}")]
+    ])
+
+def _split_message(text, limit=MAX_MESSAGE_LENGTH):
+    """
+    Split a message into parts Telegram will accept, breaking between lines
+    and hard-wrapping any single line longer than the limit.
+    
+    Args:
+        text (str): Message text
+        limit (int, optional): Maximum length of each part. Defaults to MAX_MESSAGE_LENGTH.
+    
+    Returns:
+        list: Message parts, in order
+    """
+    parts = []
+    current = ''
+    for line in text.splitlines(keepends=True):
+        if current and len(current) + len(line) > limit:
+            parts.append(current)
+            current = ''
+        # A line too long for a message of its own is cut into limit-sized pieces
+        while len(line) > limit:
+            parts.append(line[:limit])
+            line = line[limit:]
+        current += line
+    if current:
+        parts.append(current)
+    return parts
+
+def _timed(method):
+    """
+    Log a warning when a handler or scheduled job takes longer than
+    SLOW_CALL_THRESHOLD seconds.
+    
+    Args:
+        method (function): InternBot method to time
+    
+    Returns:
+        function: Wrapped method
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            if elapsed > SLOW_CALL_THRESHOLD:
+                logger.warning("Slow call: %s took %.2fs", method.__name__, elapsed)
+    return wrapper
+
 class InternBot:
     """
     Main bot class for the InternBot Telegram bot.
     """
+    # (command, handler method, description shown in Telegram's command menu)
+    _COMMANDS = (
+        ("start", "start_command", "Say hello"),
+        ("help", "help_command", "Show what the bot can do"),
+        ("task", "task_command", "Add a new task"),
+        ("mytasks", "mytasks_command", "View your open tasks"),
+        ("alltasks", "alltasks_command", "View all team members' tasks"),
+        ("duetasks", "duetasks_command", "View tasks sorted by due date"),
+        ("syncokrs", "syncokrs_command", "Sync OKRs from the Google Sheet")
+    )
+    
     def __init__(self):
         """Initialize the bot with all required components."""
         # Initialize the sheets manager
@@ -52,11 +253,24 @@ class InternBot:
         self.task_manager = TaskManager(self.sheets_manager)
         self.okr_manager = OKRManager(self.sheets_manager)
         
-        # Store conversation states
-        self.conversation_state = {}
+        # Throttle state for messages sent to the group by _broadcast
+        self._broadcast_lock = threading.Lock()
+        self._last_broadcast_time = 0.0
         
         # Initialize the Telegram updater and dispatcher
-        self.updater = Updater(token=TELEGRAM_BOT_TOKEN)
+        # Handlers registered with run_async=True run on the dispatcher's
+        # worker pool, so one slow Sheets call doesn't hold up other users
+        # Persistence keeps open link/OKR prompts across restarts
+        self.updater = Updater(
+            token=TELEGRAM_BOT_TOKEN,
+            workers=HANDLER_WORKERS,
+            request_kwargs={'con_pool_size': CONNECTION_POOL_SIZE},
+            persistence=PicklePersistence(
+                filename=STATE_FILE,
+                store_chat_data=False,
+                store_bot_data=False
+            )
+        )
         self.dispatcher = self.updater.dispatcher
         
         # Register command handlers
@@ -65,71 +279,88 @@ class InternBot:
         # Initialize the scheduler with proper timezone and job store
         self.scheduler = BackgroundScheduler(
             timezone=IST_TIMEZONE,
-            job_defaults={'misfire_grace_time': 3600}  # Allow jobs to run up to an hour late
+            executors={'default': ThreadPoolExecutor(max_workers=SCHEDULER_WORKERS)},
+            job_defaults={
+                'misfire_grace_time': 3600,  # Allow jobs to run up to an hour late
+                'coalesce': True,  # Run a job once even if several runs were missed
+                'max_instances': 1
+            }
         )
         
         # Set up scheduled tasks
         self.setup_scheduled_tasks()
         
         # Log scheduled jobs
-        logger.info("Scheduled tasks setup complete")
-        for job in self.scheduler.get_jobs():
-            logger.info(f"Job scheduled: {job.id}")
-        logger.info("Next run times will be available after scheduler starts")
+        logger.info(
+            "Scheduled tasks setup complete: %s",
+            ", ".join(job.id for job in self.scheduler.get_jobs())
+        )
     
     def register_handlers(self):
         """Register all command and callback handlers."""
         # Command handlers
-        self.dispatcher.add_handler(CommandHandler("start", self.start_command))
-        self.dispatcher.add_handler(CommandHandler("help", self.help_command))
-        self.dispatcher.add_handler(CommandHandler("task", self.task_command))
-        self.dispatcher.add_handler(CommandHandler("mytasks", self.mytasks_command))
-        self.dispatcher.add_handler(CommandHandler("alltasks", self.alltasks_command))
-        self.dispatcher.add_handler(CommandHandler("duetasks", self.duetasks_command))
-        self.dispatcher.add_handler(CommandHandler("syncokrs", self.syncokrs_command))
+        for command, method_name, _ in self._COMMANDS:
+            self.dispatcher.add_handler(CommandHandler(command, getattr(self, method_name), run_async=True))
         
-        # Callback query handler for buttons
-        self.dispatcher.add_handler(CallbackQueryHandler(self.button_callback))
+        # Conversations that prompt for a reply after a button click; only
+        # users with an open conversation have their text messages handled
+        # Text replies are only read from the team group and private chats.
+        # These handlers stay synchronous: a run_async handler's state is a
+        # Promise, which the persistent conversation can't pickle
+        allowed_chats = Filters.chat(chat_id=int(TELEGRAM_GROUP_CHAT_ID)) | Filters.chat_type.private
+        text_filter = Filters.text & ~Filters.command & allowed_chats
+        self.dispatcher.add_handler(ConversationHandler(
+            entry_points=[
+                CallbackQueryHandler(self._enter_addlink, pattern=r'^addlink:'),
+                CallbackQueryHandler(self._enter_okr_update, pattern=r'^okr_')
+            ],
+            states={
+                AWAIT_LINK: [MessageHandler(text_filter, self._receive_link)],
+                AWAIT_OKR_VALUE: [MessageHandler(text_filter, self._receive_okr_value)]
+            },
+            fallbacks=[],
+            allow_reentry=True,
+            conversation_timeout=CONVERSATION_TIMEOUT,
+            name='task_prompts',
+            persistent=True
+        ))
         
-        # Message handler for OKR updates
-        self.dispatcher.add_handler(MessageHandler(Filters.text & ~Filters.command, self.message_handler))
+        # Callback query handlers for the remaining buttons, matched on the action prefix
+        self.dispatcher.add_handler(CallbackQueryHandler(self._done_callback, pattern=r'^done:', run_async=True))
+        self.dispatcher.add_handler(CallbackQueryHandler(self._nolink_callback, pattern=r'^nolink:', run_async=True))
         
         # Error handler
         self.dispatcher.add_error_handler(self.error_handler)
     
     def setup_scheduled_tasks(self):
         """Set up scheduled tasks using APScheduler."""
-        # Daily planning reminder (10:00 AM IST)
-        hour, minute = map(int, DAILY_PLANNING_TIME.split(':'))
-        self.scheduler.add_job(
-            self.send_daily_planning_reminder,
-            trigger=CronTrigger(hour=hour, minute=minute, timezone=IST_TIMEZONE),
-            id='daily_planning'
-        )
+        # Job id -> job function; each runs on its trigger in SCHEDULE_TRIGGERS
+        jobs = {
+            'daily_planning': self.send_daily_planning_reminder,
+            'daily_nudge': self.send_daily_nudge,
+            'midday_checkin': self.send_midday_checkin,
+            'eod_summary': self.send_eod_summary
+        }
         
-        # Daily nudge (11:00 AM IST)
-        hour, minute = map(int, DAILY_NUDGE_TIME.split(':'))
-        self.scheduler.add_job(
-            self.send_daily_nudge,
-            trigger=CronTrigger(hour=hour, minute=minute, timezone=IST_TIMEZONE),
-            id='daily_nudge'
-        )
+        for job_id, job_function in jobs.items():
+            self.scheduler.add_job(job_function, trigger=SCHEDULE_TRIGGERS[job_id], id=job_id)
         
-        # Mid-day check-in (3:00 PM IST)
-        hour, minute = map(int, MIDDAY_CHECK_TIME.split(':'))
-        self.scheduler.add_job(
-            self.send_midday_checkin,
-            trigger=CronTrigger(hour=hour, minute=minute, timezone=IST_TIMEZONE),
-            id='midday_checkin'
-        )
-        
-        # End-of-day summary (7:00 PM IST)
-        hour, minute = map(int, EOD_SUMMARY_TIME.split(':'))
-        self.scheduler.add_job(
-            self.send_eod_summary,
-            trigger=CronTrigger(hour=hour, minute=minute, timezone=IST_TIMEZONE),
-            id='eod_summary'
-        )
+        # Opt-in memory profiling
+        if DEBUG_MEM:
+            tracemalloc.start()
+            self._memory_snapshot = tracemalloc.take_snapshot()
+            self.scheduler.add_job(
+                self.log_memory_growth,
+                trigger=IntervalTrigger(minutes=MEMORY_SNAPSHOT_INTERVAL),
+                id='memory_snapshot'
+            )
+    
+    def log_memory_growth(self):
+        """Log the lines whose allocations grew most since the last snapshot."""
+        snapshot = tracemalloc.take_snapshot()
+        for stat in snapshot.compare_to(self._memory_snapshot, 'lineno')[:10]:
+            logger.info("Memory growth: %s", stat)
+        self._memory_snapshot = snapshot
     
     def start(self):
         """Start the bot and scheduler."""
@@ -139,17 +370,49 @@ class InternBot:
             logger.info("Scheduler started successfully")
             
             # Log all scheduled jobs
-            for job in self.scheduler.get_jobs():
-                logger.info(f"Active job: {job.id} - Next run: {job.next_run_time}")
+            logger.info(
+                "Active jobs: %s",
+                ", ".join(f"{job.id} (next run {job.next_run_time})" for job in self.scheduler.get_jobs())
+            )
             
-            # Start the bot
-            self.updater.start_polling()
+            # Start the bot; webhook mode needs a public URL, so fall back to polling without one
+            if BOT_MODE == 'webhook' and not WEBHOOK_URL:
+                logger.warning("MODE=webhook but WEBHOOK_URL is not set; falling back to polling")
+            if BOT_MODE == 'webhook' and WEBHOOK_URL:
+                # Telegram pushes updates to WEBHOOK_URL/WEBHOOK_PATH; passing
+                # webhook_url makes the updater register it with setWebhook
+                self.updater.start_webhook(
+                    listen=WEBHOOK_LISTEN,
+                    port=int(PORT),
+                    url_path=WEBHOOK_PATH,
+                    webhook_url=f"{WEBHOOK_URL.rstrip('/')}/{WEBHOOK_PATH}",
+                    allowed_updates=ALLOWED_UPDATES
+                )
+                logger.info("Receiving updates via webhook on port %s", PORT)
+            else:
+                # Polling bootstrap also deletes any webhook left registered.
+                # A long timeout lets Telegram hold each getUpdates open
+                # until something arrives instead of answering empty.
+                self.updater.start_polling(
+                    poll_interval=0.0,
+                    timeout=POLLING_TIMEOUT,
+                    read_latency=2.0,
+                    allowed_updates=ALLOWED_UPDATES
+                )
             logger.info("Bot started. Press Ctrl+C to stop.")
             
+            # Publish the command menu from the same table the handlers use.
+            # The menu is optional, so a failure here mustn't stop the bot
+            try:
+                self.updater.bot.set_my_commands([
+                    BotCommand(command, description) for command, _, description in self._COMMANDS
+                ])
+            except Exception as e:
+                logger.warning("Could not publish the command menu: %s", e)
+            
             # Send a startup message to the group chat
-            self.updater.bot.send_message(
-                chat_id=TELEGRAM_GROUP_CHAT_ID,
-                text="🤖 InternBot is now online! Type /help to see available commands."
+            self._broadcast(
+                "🤖 InternBot is now online! Type /help to see available commands."
             )
             
             # Run the bot until you press Ctrl-C
@@ -162,41 +425,17 @@ class InternBot:
                 self.scheduler.shutdown()
                 logger.info("Scheduler shut down")
     
+    @_timed
     def start_command(self, update: Update, context: CallbackContext):
         """Handle the /start command."""
-        update.message.reply_text(
-            "👋 Hello! I'm your startup accountability partner. "
-            "I'll help you track tasks and OKRs. "
-            "Type /help to see what I can do."
-        )
+        update.message.reply_text(START_TEXT, disable_web_page_preview=True)
     
+    @_timed
     def help_command(self, update: Update, context: CallbackContext):
         """Handle the /help command."""
-        help_text = (
-            "*InternBot - Your Startup Accountability Partner*\n\n"
-            "*Commands:*\n"
-            "• `/task [Priority] [Description] -c [Category] -d [YYYY-MM-DD] -a [Assignee]` - Add a new task\n"
-            "  Priority must be P1 (High), P2 (Medium), or P3 (Low)\n"
-            "  Category is optional (default: General)\n"
-            "  Due date is optional in YYYY-MM-DD format\n"
-            "  Assignee is optional (default: yourself)\n"
-            "  Example: `/task P1 Draft investor email -c Partnerships -d 2025-07-05 -a teammate`\n\n"
-            "• `/mytasks` - View your open tasks\n\n"
-            "• `/alltasks` - View all team members' tasks\n\n"
-            "• `/duetasks` - View tasks sorted by due date\n\n"
-            "• `/syncokrs` - Sync OKRs from the Google Sheet\n\n"
-            "*Task Completion:*\n"
-            "When marking a task as done, you'll be prompted to provide a link to your completed work (document, presentation, etc.).\n"
-            "This helps with accountability and makes it easier for the team to review your work.\n\n"
-            "*Daily Schedule (IST):*\n"
-            "• *10:00 AM* - Daily planning reminder\n"
-            "• *11:00 AM* - Nudge for missing tasks\n"
-            "• *3:00 PM* - Mid-day progress check\n"
-            "• *7:00 PM* - End-of-day summary and OKR updates"
-        )
-        
-        update.message.reply_text(help_text, parse_mode=ParseMode.MARKDOWN)
+        update.message.reply_text(HELP_TEXT, parse_mode=ParseMode.MARKDOWN, disable_web_page_preview=True)
     
+    @_timed
     def task_command(self, update: Update, context: CallbackContext):
         """Handle the /task command to add a new task."""
         # Get the user's username
@@ -214,134 +453,83 @@ class InternBot:
         # Add the task
         success, message = self.task_manager.add_task(username, command_text)
         
-        # Reply with the result
-        update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+        # Reply with the result; only the usage hint contains Markdown, the
+        # confirmation echoes the user's own text and is sent as-is
+        update.message.reply_text(message, parse_mode=None if success else ParseMode.MARKDOWN)
     
+    @_timed
+    @_safe_handler("Error retrieving your tasks")
     def mytasks_command(self, update: Update, context: CallbackContext):
         """Handle the /mytasks command to view user's tasks."""
-        try:
-            # Get the user's username
-            username = update.effective_user.username
-            
-            if not username:
-                update.message.reply_text(
-                    "Please set a username in your Telegram settings first."
-                )
-                return
-            
-            # Log the username for debugging
-            logging.info(f"Fetching tasks for username: {username}")
-            
-            try:
-                # Get the user's tasks
-                message, reply_markup = self.task_manager.get_user_tasks_message(username)
-                
-                # Log the raw message for debugging
-                logging.info(f"DEBUG - Raw message content for {username}: {message}")
-                
-                # Remove Markdown formatting to avoid parsing errors
-                clean_message = message.replace('**', '').replace('*', '')
-                
-                # Log the cleaned message for debugging
-                logging.info(f"DEBUG - Cleaned message content for {username}: {clean_message}")
-                
-                # Reply with the tasks without parse_mode
-                update.message.reply_text(
-                    clean_message,
-                    reply_markup=reply_markup
-                )
-                logging.info(f"Successfully sent tasks for {username} with no parse mode")
-            except Exception as e:
-                logging.error(f"Error getting tasks for {username}: {str(e)}")
-                logging.error(f"Error details: {type(e).__name__}, {e.__traceback__.tb_lineno}")
-                update.message.reply_text(
-                    f"Error retrieving your tasks: {str(e)}"
-                )
-        except Exception as e:
-            logging.error(f"Error in mytasks_command: {str(e)}")
-            logging.error(f"Error details: {type(e).__name__}, {e.__traceback__.tb_lineno}")
+        # Get the user's username
+        username = update.effective_user.username
+        
+        if not username:
             update.message.reply_text(
-                "Sorry, something went wrong. Please try again later."
+                "Please set a username in your Telegram settings first."
             )
-            
+            return
+        
+        # Log the username for debugging
+        logger.info("Fetching tasks for username: %s", username)
+        
+        # Get the user's tasks
+        message, reply_markup = self.task_manager.get_user_tasks_message(username)
+        
+        # Log the message for debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Message content for %s: %s", username, message)
+        
+        # Reply with the tasks without parse_mode
+        update.message.reply_text(
+            message,
+            reply_markup=reply_markup
+        )
+        logger.info("Successfully sent tasks for %s with no parse mode", username)
+    
+    @_timed
+    @_safe_handler("Error retrieving all tasks")
     def alltasks_command(self, update: Update, context: CallbackContext):
         """Handle the /alltasks command to view all users' tasks."""
-        try:
-            # Log the request
-            username = update.effective_user.username
-            logging.info(f"User {username} requested all tasks")
-            
-            try:
-                # Get all tasks
-                message, reply_markup = self.task_manager.get_all_open_tasks_message()
-                
-                # Reply with the tasks - dont use parse_mode to avoid entity parsing errors
-                # Remove markdown formatting from the message
-                clean_message = message.replace("**", "").replace("*", "")
-                
-                update.message.reply_text(
-                    clean_message,
-                    reply_markup=reply_markup
-                )
-                logging.info("Successfully sent all tasks message with no parse mode")
-            except Exception as e:
-                logging.error(f"Error getting all tasks: {str(e)}")
-                update.message.reply_text(
-                    f"Error retrieving all tasks: {str(e)}"
-                )
-        except Exception as e:
-            logging.error(f"Error in alltasks_command: {str(e)}")
-            update.message.reply_text(
-                "Sorry, something went wrong. Please try again later."
-            )
-            update.message.reply_text(
-                "Sorry, something went wrong. Please try again later."
-            )
-            
+        # Log the request
+        username = update.effective_user.username
+        logger.info("User %s requested all tasks", username)
+        
+        # Get all tasks
+        message, reply_markup = self.task_manager.get_all_open_tasks_message()
+        
+        # Reply with the tasks - dont use parse_mode to avoid entity parsing errors
+        update.message.reply_text(
+            message,
+            reply_markup=reply_markup
+        )
+        logger.info("Successfully sent all tasks message with no parse mode")
+    
+    @_timed
+    @_safe_handler("Error retrieving tasks by due date")
     def duetasks_command(self, update: Update, context: CallbackContext):
         """Handle the /duetasks command to view tasks sorted by due date."""
-        try:
-            # Log the request
-            username = update.effective_user.username
-            logging.info(f"User {username} requested tasks sorted by due date")
-            
-            try:
-                # Get tasks sorted by due date
-                message, reply_markup = self.task_manager.get_due_tasks_message()
-                
-                # Log the raw message for debugging
-                logging.info(f"DEBUG - Raw due tasks message: {message[:200]}...")
-                
-                # Remove Markdown formatting to avoid parsing errors
-                clean_message = message.replace('**', '').replace('*', '')
-                
-                # Log the cleaned message for debugging
-                logging.info(f"DEBUG - Cleaned due tasks message: {clean_message[:200]}...")
-                
-                # Reply with the tasks without parse_mode
-                update.message.reply_text(
-                    clean_message,
-                    reply_markup=reply_markup
-                )
-                logging.info("Successfully sent due tasks message with no parse mode")
-            except Exception as e:
-                logging.error(f"Error getting due tasks: {str(e)}")
-                logging.error(f"Error details: {type(e).__name__}, {e.__traceback__.tb_lineno}")
-                update.message.reply_text(
-                    f"Error retrieving tasks by due date: {str(e)}"
-                )
-        except Exception as e:
-            logging.error(f"Error in duetasks_command: {str(e)}")
-            logging.error(f"Error details: {type(e).__name__}, {e.__traceback__.tb_lineno}")
-            update.message.reply_text(
-                "Sorry, something went wrong. Please try again later."
-            )
+        # Log the request
+        username = update.effective_user.username
+        logger.info("User %s requested tasks sorted by due date", username)
+        
+        # Get tasks sorted by due date
+        message, reply_markup = self.task_manager.get_due_tasks_message()
+        
+        # Log the message for debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Due tasks message: %s...", message[:200])
+        
+        # Reply with the tasks without parse_mode
+        update.message.reply_text(
+            message,
+            reply_markup=reply_markup
+        )
+        logger.info("Successfully sent due tasks message with no parse mode")
     
+    @_timed
     def syncokrs_command(self, update: Update, context: CallbackContext):
         """Handle the /syncokrs command to sync OKRs from the Google Sheet and display a summary."""
-        import logging
-        logger = logging.getLogger(__name__)
-        
         logger.info("Handling /syncokrs command")
         
         # First, let the user know we're syncing
@@ -367,60 +555,71 @@ class InternBot:
             )
             logger.error("Failed to sync OKRs")
     
-    def button_callback(self, update: Update, context: CallbackContext):
-        """Handle button callbacks."""
+    @_timed
+    def _done_callback(self, update: Update, context: CallbackContext):
+        """Handle "done" button clicks by asking how to complete the task."""
         query = update.callback_query
+        task_id = query.data.partition(':')[2]
         
-        # Get the callback data
-        data = query.data
+        # Acknowledge the callback query
+        query.answer()
         
-        # Handle "done" button clicks
-        if data.startswith('done:'):
-            task_id = data.replace('done:', '')
-            
-            # Create inline keyboard with options for link submission
-            keyboard = [
-                [InlineKeyboardButton("✅ Mark as Done (No Link)", callback_data=f"nolink:{task_id}")],
-                [InlineKeyboardButton("📎 Add Link to Completed Work", callback_data=f"addlink:{task_id}")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            # Acknowledge the callback query
-            query.answer()
-            
-            # Ask user to choose an option
-            query.message.reply_text(
-                "How would you like to complete this task?",
-                reply_markup=reply_markup
-            )
+        # Ask user to choose an option; the prompt replies to the task list,
+        # so the list can be found again once the task is done
+        query.message.reply_text(
+            "How would you like to complete this task?",
+            reply_markup=_done_prompt_keyboard(task_id),
+            quote=True
+        )
+    
+    @_timed
+    def _nolink_callback(self, update: Update, context: CallbackContext):
+        """Handle "no link" button clicks."""
+        query = update.callback_query
+        task_id = query.data.partition(':')[2]
+        query.answer("Marking task as done without a link")
+        self.handle_task_done(query, task_id, None)
+    
+    @_timed
+    def _enter_addlink(self, update: Update, context: CallbackContext):
+        """Handle "add link" button clicks by asking for a completion link."""
+        query = update.callback_query
         
-        # Handle "no link" button clicks
-        elif data.startswith('nolink:'):
-            task_id = data.replace('nolink:', '')
-            query.answer("Marking task as done without a link")
-            self.handle_task_done(query, task_id, None)
-        
-        # Handle "add link" button clicks
-        elif data.startswith('addlink:'):
-            task_id = data.replace('addlink:', '')
-            # Store task_id in context for the conversation
-            context.user_data['completing_task_id'] = task_id
-            
-            # Acknowledge the callback query
-            query.answer()
-            
-            # Ask for a completion link
-            query.message.reply_text(
-                "📎 Please send a link to your completed work (document, presentation, etc.)"
-            )
-            
-            # Set the conversation state
-            context.user_data['awaiting_completion_link'] = True
+        # Store task_id and the task list in context for the conversation
+        context.user_data['completing_task_id'] = query.data.partition(':')[2]
+        context.user_data['completing_task_list'] = self._task_list_ref(query.message.reply_to_message)
         
-        # Handle OKR update button clicks
-        elif data.startswith('okr_'):
-            okr_id = data.replace('okr_', '')
-            self.handle_okr_update(query, okr_id)
+        # Acknowledge the callback query
+        query.answer()
+        
+        # Ask for a completion link
+        query.message.reply_text(
+            "📎 Please send a link to your completed work (document, presentation, etc.)"
+        )
+        return AWAIT_LINK
+    
+    @_timed
+    def _enter_okr_update(self, update: Update, context: CallbackContext):
+        """Handle OKR update button clicks."""
+        query = update.callback_query
+        return self.handle_okr_update(query, context, query.data.partition('_')[2])
+    
+    @staticmethod
+    def _completion_msg(task_description, completion_link=None):
+        """
+        Format the confirmation sent when a task is marked as done.
+        
+        Args:
+            task_description (str): Description of the completed task
+            completion_link (str, optional): Link to the completed work
+        
+        Returns:
+            str: MarkdownV2-formatted confirmation message
+        """
+        message = f"✅ *Task completed successfully\\!*\n\n📝 *Task:* {escape_markdown(task_description, version=2)}\n"
+        if completion_link:
+            message += f"🔗 *Submission:* {escape_markdown(completion_link, version=2)}\n"
+        return message + "\nGreat job completing this task\\!"
     
     def handle_task_done(self, query, task_id, completion_link=None):
         """Handle marking a task as done with an optional completion link."""
@@ -429,76 +628,105 @@ class InternBot:
         
         if success:
             # Get task details for a more informative message
-            all_tasks = self.sheets_manager.task_log.get_all_records()
-            task = next((t for t in all_tasks if t['Task_ID'] == task_id), None)
+            task = self.sheets_manager.get_task_by_id(task_id)
             
             # Get task description
-            task_description = task.get('Description', 'this task') if task else 'this task'
+            task_description = task.get('Task_Description', 'this task') if task else 'this task'
             
             # Send a confirmation message
-            if completion_link:
-                query.message.reply_text(
-                    f"✅ *Task completed successfully!*\n\n"
-                    f"📝 *Task:* {task_description}\n"
-                    f"🔗 *Submission:* {completion_link}\n\n"
-                    f"Great job completing this task!",
-                    parse_mode=ParseMode.MARKDOWN
-                )
-            else:
-                query.message.reply_text(
-                    f"✅ *Task completed successfully!*\n\n"
-                    f"📝 *Task:* {task_description}\n\n"
-                    f"Great job completing this task!",
-                    parse_mode=ParseMode.MARKDOWN
-                )
-            
-            # Edit the original message to show the task as done
-            message = query.message.text
-            
-            if task:
-                # Create a pattern to find the task line
-                task_desc = re.escape(task['Task_Description'])
-                pattern = f"(• .+{task_desc}.+\n)"
-                
-                # Replace with strikethrough
-                new_message = re.sub(
-                    pattern, 
-                    f"• ~{task['Task_Description']}~ ✅\n", 
-                    message
-                )
-                
-                # Update the message
-                query.edit_message_text(
-                    text=new_message,
-                    parse_mode=ParseMode.MARKDOWN
-                )
+            query.message.reply_text(
+                self._completion_msg(task_description, completion_link),
+                parse_mode=ParseMode.MARKDOWN_V2
+            )
             
-            # Answer the callback query
-            query.answer("Task marked as done!")
+            # Show the task as done in the list it was picked from
+            list_ref = self._task_list_ref(query.message.reply_to_message)
+            if task and list_ref:
+                self._strike_task_line(list_ref, task_id, task['Task_Description'])
         else:
-            query.answer("Failed to mark task as done.")
+            query.message.reply_text("❌ Failed to mark task as done. Please try again.")
     
-    def handle_okr_update(self, query, okr_id):
-        """Handle OKR update button clicks."""
+    @staticmethod
+    def _task_list_ref(message):
+        """
+        Capture what is needed to edit a task list message later.
+        
+        Args:
+            message (telegram.Message): The task list, or None
+        
+        Returns:
+            dict: Chat ID, message ID, MarkdownV2 text and keyboard of the
+                list, or None if there is no list with text
+        """
+        if not message or not message.text:
+            return None
+        return {
+            'chat_id': message.chat_id,
+            'message_id': message.message_id,
+            # The MarkdownV2 rendering keeps tasks struck through earlier
+            'text': message.text_markdown_v2,
+            'keyboard': message.reply_markup.to_dict() if message.reply_markup else None
+        }
+    
+    def _strike_task_line(self, list_ref, task_id, task_description):
+        """
+        Strike a completed task through in a task list and drop its done button.
+        
+        Args:
+            list_ref (dict): Task list, as returned by _task_list_ref
+            task_id (str): ID of the completed task
+            task_description (str): Description of the completed task
+        """
+        # Rewrite the task's bullet line; the list text is already escaped
+        task_desc = escape_markdown(task_description, version=2)
+        lines = list_ref['text'].split('\n')
+        for i, line in enumerate(lines):
+            if line.startswith('• ') and line.find(task_desc) != -1:
+                lines[i] = f"• ~{task_desc}~ ✅"
+                break
+        else:
+            return
+        
+        # Keep the buttons for the other tasks
+        reply_markup = None
+        if list_ref['keyboard']:
+            done_data = f"done:{task_id}"
+            rows = [
+                row for row in list_ref['keyboard']['inline_keyboard']
+                if not any(button.get('callback_data') == done_data for button in row)
+            ]
+            if rows:
+                reply_markup = InlineKeyboardMarkup.de_json({'inline_keyboard': rows}, self.updater.bot)
+        
+        try:
+            self.updater.bot.edit_message_text(
+                chat_id=list_ref['chat_id'],
+                message_id=list_ref['message_id'],
+                text='\n'.join(lines),
+                parse_mode=ParseMode.MARKDOWN_V2,
+                reply_markup=reply_markup
+            )
+        except TelegramError as e:
+            logger.warning("Could not update the task list for task %s: %s", task_id, e)
+    
+    def handle_okr_update(self, query, context, okr_id):
+        """Handle OKR update button clicks by asking for the new value."""
         # Get the user's username
         username = query.from_user.username
         
         if not username:
             query.answer("Please set a username in your Telegram settings first.")
-            return
+            return ConversationHandler.END
         
         # Get the OKR
         okr = self.okr_manager.get_okr_by_id(okr_id)
         
         if not okr:
             query.answer("OKR not found. Please use /syncokrs to refresh.")
-            return
+            return ConversationHandler.END
         
-        # Set the conversation state
-        self.conversation_state[username] = {
-            'waiting_for': 'okr_update',
-            'okr_id': okr_id
-        }
+        # Remember which OKR is being updated
+        context.user_data['updating_okr_id'] = okr_id
         
         # Answer the callback query
         query.answer()
@@ -508,115 +736,134 @@ class InternBot:
             f"What's the current number for '{okr['Goal_Name']}'?",
             reply_markup=None
         )
+        return AWAIT_OKR_VALUE
     
-    def message_handler(self, update: Update, context: CallbackContext):
-        """Handle text messages."""
-        # Get the user's username
+    @_timed
+    def _receive_link(self, update: Update, context: CallbackContext):
+        """Handle the completion link sent after clicking "add link"."""
         username = update.effective_user.username
+        logger.info("Processing completion link submission from %s", username)
         
-        # Log the incoming message for debugging
-        logger.info(f"Received message from {username}: {update.message.text}")
+        # Get the task ID
+        task_id = context.user_data.get('completing_task_id')
         
-        if not username:
-            update.message.reply_text("Please set a username in your Telegram settings first.")
-            return
+        # Get the link from the message
+        link = update.message.text.strip()
+        
+        # Validate the link format if provided
+        if link.lower() != 'none':
+            # Require an http(s) URL with a host
+            parsed_link = urlparse(link)
+            if parsed_link.scheme not in ('http', 'https') or not parsed_link.netloc:
+                update.message.reply_text(
+                    "⚠️ Please provide a valid URL starting with http:// or https:// \n"
+                    "Or type 'none' if there's no link to share."
+                )
+                return AWAIT_LINK
+        else:
+            link = None
+        
+        # Mark the task as done with the link
+        success = self.task_manager.mark_task_as_done(task_id, link)
         
-        # Check if we're waiting for a completion link
-        if 'awaiting_completion_link' in context.user_data and context.user_data['awaiting_completion_link']:
-            logger.info(f"Processing completion link submission from {username}")
-            # Get the task ID
-            task_id = context.user_data.get('completing_task_id')
+        # Clear the conversation data
+        context.user_data.pop('completing_task_id', None)
+        list_ref = context.user_data.pop('completing_task_list', None)
+        logger.info("Task completion result: %s", success)
+        
+        if success:
+            # Get task details for a more informative message
+            task = self.sheets_manager.get_task_by_id(task_id)
             
-            if task_id:
-                # Get the link from the message
-                link = update.message.text.strip()
-                
-                # Validate the link format if provided
-                if link.lower() != 'none':
-                    # Simple URL validation (starts with http:// or https://)
-                    if not (link.startswith('http://') or link.startswith('https://')):
-                        update.message.reply_text(
-                            "⚠️ Please provide a valid URL starting with http:// or https:// \n"
-                            "Or type 'none' if there's no link to share."
-                        )
-                        return
-                else:
-                    link = None
-                
-                # Mark the task as done with the link
-                success = self.task_manager.mark_task_as_done(task_id, link)
-                
-                # Clear the conversation state
-                context.user_data.pop('awaiting_completion_link', None)
-                context.user_data.pop('completing_task_id', None)
-                logger.info(f"Task completion result: {success}, cleared conversation state")
-                
-                if success:
-                    # Get task details for a more informative message
-                    all_tasks = self.sheets_manager.task_log.get_all_records()
-                    task = next((t for t in all_tasks if t['Task_ID'] == task_id), None)
-                    
-                    task_description = task.get('Description', 'this task') if task else 'this task'
-                    
-                    # Format the response message
-                    if link and link.lower() != 'none':
-                        update.message.reply_text(
-                            f"✅ *Task completed successfully!*\n\n"
-                            f"📝 *Task:* {task_description}\n"
-                            f"🔗 *Submission:* {link}\n\n"
-                            f"Great job completing this task!",
-                            parse_mode=ParseMode.MARKDOWN
-                        )
-                    else:
-                        update.message.reply_text(
-                            f"✅ *Task completed successfully!*\n\n"
-                            f"📝 *Task:* {task_description}\n\n"
-                            f"Great job completing this task!",
-                            parse_mode=ParseMode.MARKDOWN
-                        )
-                else:
-                    update.message.reply_text("❌ Failed to mark task as done. Please try again.")
-                return
-        
-        # Check if we're waiting for an OKR update from this user
-        if username in self.conversation_state and self.conversation_state[username].get('waiting_for') == 'okr_update':
-            logger.info(f"Processing OKR update from {username}")
+            task_description = task.get('Task_Description', 'this task') if task else 'this task'
             
-            # Get the OKR ID
-            okr_id = self.conversation_state[username].get('okr_id')
-            if not okr_id:
-                logger.error(f"Missing OKR ID in conversation state for {username}")
-                update.message.reply_text("Something went wrong. Please try updating your OKR again.")
-                del self.conversation_state[username]
-                return
+            update.message.reply_text(
+                self._completion_msg(task_description, link),
+                parse_mode=ParseMode.MARKDOWN_V2
+            )
             
-            # Get the new value
-            new_value = update.message.text.strip()
-            logger.info(f"Updating OKR {okr_id} with new value: {new_value}")
+            # Show the task as done in the list it was picked from
+            if task and list_ref:
+                self._strike_task_line(list_ref, task_id, task['Task_Description'])
+        else:
+            update.message.reply_text("❌ Failed to mark task as done. Please try again.")
+        return ConversationHandler.END
+    
+    @_timed
+    def _receive_okr_value(self, update: Update, context: CallbackContext):
+        """Handle the new OKR value sent after clicking an OKR button."""
+        username = update.effective_user.username
+        logger.info("Processing OKR update from %s", username)
+        
+        # Get the OKR ID
+        okr_id = context.user_data.pop('updating_okr_id', None)
+        if not okr_id:
+            logger.error("Missing OKR ID in conversation data for %s", username)
+            update.message.reply_text("Something went wrong. Please try updating your OKR again.")
+            return ConversationHandler.END
+        
+        # Get the new value
+        new_value = update.message.text.strip()
+        logger.info("Updating OKR %s with new value: %s", okr_id, new_value)
+        
+        try:
+            # Update the OKR progress
+            success, feedback = self.okr_manager.update_okr_progress(username, okr_id, new_value)
+            logger.info("OKR update result: %s", success)
             
+            # Reply with the feedback
+            update.message.reply_text(feedback)
+        except Exception as e:
+            logger.error("Error updating OKR: %s", e)
+            update.message.reply_text(f"Error updating OKR: {str(e)}")
+        return ConversationHandler.END
+    
+    def _broadcast(self, text, **kwargs):
+        """
+        Send a message to the team group, spaced out from the previous one.
+        
+        Args:
+            text (str): Message text
+            **kwargs: Other send_message arguments, e.g. parse_mode or reply_markup
+        
+        Returns:
+            telegram.Message: The sent message
+        """
+        # Space group messages out so back-to-back broadcasts stay under the
+        # per-group limit instead of running into RetryAfter
+        with self._broadcast_lock:
+            wait = self._last_broadcast_time + GROUP_MESSAGE_INTERVAL - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._last_broadcast_time = time.monotonic()
+        
+        return self._safe_send(TELEGRAM_GROUP_CHAT_ID, text, **kwargs)
+    
+    def _safe_send(self, chat_id, text, **kwargs):
+        """
+        Send a message, waiting out Telegram flood limits.
+        
+        Args:
+            chat_id (int or str): Chat to send to
+            text (str): Message text
+            **kwargs: Other send_message arguments, e.g. parse_mode or reply_markup
+        
+        Returns:
+            telegram.Message: The sent message
+        """
+        for attempt in range(1, SEND_ATTEMPTS + 1):
             try:
-                # Update the OKR progress
-                success, feedback = self.okr_manager.update_okr_progress(username, okr_id, new_value)
-                
-                # Clear the conversation state
-                del self.conversation_state[username]
-                logger.info(f"OKR update result: {success}, cleared conversation state")
-                
-                # Reply with the feedback
-                update.message.reply_text(feedback)
-            except Exception as e:
-                logger.error(f"Error updating OKR: {e}")
-                update.message.reply_text(f"Error updating OKR: {str(e)}")
-                # Clear the conversation state on error
-                if username in self.conversation_state:
-                    del self.conversation_state[username]
-        
-        self.updater.bot.send_message(
-            chat_id=TELEGRAM_GROUP_CHAT_ID,
-            text=message,
-            parse_mode=ParseMode.MARKDOWN
-        )
+                return self.updater.bot.send_message(chat_id=chat_id, text=text, **kwargs)
+            except RetryAfter as e:
+                if attempt == SEND_ATTEMPTS:
+                    raise
+                # Never retry before Retry-After; the jitter keeps threads
+                # that were limited together from retrying together
+                delay = e.retry_after * random.uniform(1.0, 1.5)
+                logger.warning("Flood limit hit, retrying send to %s in %.1fs", chat_id, delay)
+                time.sleep(delay)
     
+    @_timed
     def send_daily_planning_reminder(self):
         """Send the daily planning reminder at 10:00 AM IST."""
         message = (
@@ -626,58 +873,53 @@ class InternBot:
         
         try:
             logger.info("Sending daily planning reminder")
-            self.updater.bot.send_message(
-                chat_id=TELEGRAM_GROUP_CHAT_ID,
-                text=message,
+            self._broadcast(
+                message,
                 parse_mode=ParseMode.MARKDOWN
             )
             logger.info("Daily planning reminder sent successfully")
         except Exception as e:
             logger.error(f"Error sending daily planning reminder: {e}")
     
+    @_timed
     def send_daily_nudge(self):
         """Send nudges to users who haven't added tasks at 11:00 AM IST."""
         # Get all users in the group
         try:
             logger.info("Starting daily nudge process")
             
-            # In test mode or when we can't get actual members, use these default usernames
-            # This ensures we're using the correct usernames for the team
-            usernames = ['Sethu_Raman_O', 'audaciousSneha']
-            logger.info(f"Using team usernames: {usernames}")
+            logger.info("Using team usernames: %s", TEAM_USERNAMES)
             
             # Check which users haven't added tasks today
-            users_without_tasks = self.task_manager.check_users_without_tasks(usernames)
-            logger.info(f"Found {len(users_without_tasks)} users without tasks today: {users_without_tasks}")
+            users_without_tasks = self.task_manager.check_users_without_tasks(TEAM_USERNAMES)
+            logger.info("Found %s users without tasks today: %s", len(users_without_tasks), users_without_tasks)
             
-            # Send nudges
-            for username in users_without_tasks:
-                message = (
-                    f"@{username}, you haven't added any tasks for the day yet. "
-                    "What's your top priority?"
+            # Send all nudges in a single message
+            if users_without_tasks:
+                message = "⏰ You haven't added any tasks for the day yet:\n" + "\n".join(
+                    f"• @{username} - what's your top priority?"
+                    for username in users_without_tasks
                 )
                 
-                self.updater.bot.send_message(
-                    chat_id=TELEGRAM_GROUP_CHAT_ID,
-                    text=message
+                self._broadcast(
+                    message
                 )
-                logger.info(f"Sent nudge to @{username}")
-            
-            if not users_without_tasks:
+                logger.info("Sent nudge to %s users", len(users_without_tasks))
+            else:
                 logger.info("All users have tasks for today, no nudges needed")
                 
             logger.info("Daily nudge process completed successfully")
         except Exception as e:
-            logger.error(f"Error sending daily nudge: {e}")
+            logger.error("Error sending daily nudge: %s", e)
             # Try to send an error notification to the group
             try:
-                self.updater.bot.send_message(
-                    chat_id=TELEGRAM_GROUP_CHAT_ID,
-                    text="⚠️ There was an error checking for daily tasks. Please check the logs."
+                self._broadcast(
+                    "⚠️ There was an error checking for daily tasks. Please check the logs."
                 )
             except:
                 pass  # Silently fail if we can't send the error message
     
+    @_timed
     def send_midday_checkin(self):
         """Send the mid-day check-in at 3:00 PM IST."""
         try:
@@ -688,41 +930,40 @@ class InternBot:
             tasks_message, reply_markup = self.task_manager.get_all_open_tasks_message()
             logger.info("Retrieved open tasks for midday check-in")
             
-            # Send the message
-            self.updater.bot.send_message(
-                chat_id=TELEGRAM_GROUP_CHAT_ID,
-                text=message
-                # No parse_mode to avoid Markdown errors
-            )
+            # Send the header and tasks as one message, split between task
+            # lines if that would go over Telegram's message length limit
+            messages = _split_message(f"{message}\n\n{tasks_message}")
             
-            # Send the tasks - use HTML instead of Markdown for better compatibility
-            try:
-                self.updater.bot.send_message(
-                    chat_id=TELEGRAM_GROUP_CHAT_ID,
-                    text=tasks_message,
-                    parse_mode=ParseMode.HTML,
-                    reply_markup=reply_markup
-                )
-            except Exception as parse_error:
-                # If HTML parsing fails, try sending without any parsing
-                logger.warning(f"HTML parsing failed: {parse_error}. Sending without parse mode.")
-                self.updater.bot.send_message(
-                    chat_id=TELEGRAM_GROUP_CHAT_ID,
-                    text=tasks_message,
-                    reply_markup=reply_markup
-                )
-            logger.info("Midday check-in sent successfully")
+            for index, text in enumerate(messages, start=1):
+                # The task buttons go under the last part
+                markup = reply_markup if index == len(messages) else None
+                
+                # Use HTML instead of Markdown for better compatibility
+                try:
+                    self._broadcast(
+                        text,
+                        parse_mode=ParseMode.HTML,
+                        reply_markup=markup
+                    )
+                except Exception as parse_error:
+                    # If HTML parsing fails, try sending without any parsing
+                    logger.warning("HTML parsing failed: %s. Sending without parse mode.", parse_error)
+                    self._broadcast(
+                        text,
+                        reply_markup=markup
+                    )
+            logger.info("Midday check-in sent successfully in %s message(s)", len(messages))
         except Exception as e:
             logger.error(f"Error sending midday check-in: {e}")
             # Try to send an error notification to the group
             try:
-                self.updater.bot.send_message(
-                    chat_id=TELEGRAM_GROUP_CHAT_ID,
-                    text="⚠️ There was an error sending the midday check-in. Please check the logs."
+                self._broadcast(
+                    "⚠️ There was an error sending the midday check-in. Please check the logs."
                 )
             except:
                 pass  # Silently fail if we can't send the error message
     
+    @_timed
     def send_eod_summary(self):
         """Send the end-of-day summary at 7:00 PM IST."""
         try:
@@ -731,81 +972,53 @@ class InternBot:
             summary = self.task_manager.get_end_of_day_summary()
             logger.info("Generated end-of-day task summary")
             
-            # Try to send with Markdown first
-            try:
-                self.updater.bot.send_message(
-                    chat_id=TELEGRAM_GROUP_CHAT_ID,
-                    text=summary,
-                    parse_mode=ParseMode.MARKDOWN
-                )
-                logger.info("Sent end-of-day task summary with Markdown")
-            except Exception as parse_error:
-                # If Markdown parsing fails, send without parse mode
-                logger.warning(f"Markdown parsing failed for EOD summary: {parse_error}. Sending without parse mode.")
-                clean_summary = summary.replace('**', '').replace('*', '')
-                self.updater.bot.send_message(
-                    chat_id=TELEGRAM_GROUP_CHAT_ID,
-                    text=clean_summary
-                )
-                logger.info("Sent end-of-day task summary without parse mode")
-            
-            # Send the OKR update message
+            # Get the OKR update message
             okr_message, reply_markup = self.okr_manager.get_okr_update_keyboard()
             logger.info("Generated OKR update keyboard")
             
-            # Try to send OKR message with Markdown
-            try:
-                if reply_markup:  # Only send if there are active OKRs
-                    self.updater.bot.send_message(
-                        chat_id=TELEGRAM_GROUP_CHAT_ID,
-                        text=okr_message,
+            # Send the summary and the OKR prompt as one message unless that
+            # would go over Telegram's message length limit
+            combined = f"{summary}\n\n{okr_message}"
+            if len(combined) <= MAX_MESSAGE_LENGTH:
+                messages = [(combined, reply_markup)]
+            else:
+                messages = [(summary, None), (okr_message, reply_markup)]
+            
+            for text, markup in messages:
+                # Try to send with Markdown first
+                try:
+                    self._broadcast(
+                        text,
                         parse_mode=ParseMode.MARKDOWN,
-                        reply_markup=reply_markup
-                    )
-                    logger.info("Sent OKR update prompt with inline keyboard")
-                else:
-                    self.updater.bot.send_message(
-                        chat_id=TELEGRAM_GROUP_CHAT_ID,
-                        text=okr_message,
-                        parse_mode=ParseMode.MARKDOWN
+                        reply_markup=markup
                     )
-                    logger.info("Sent OKR message without keyboard (no active OKRs)")
-            except Exception as parse_error:
-                # If Markdown parsing fails, send without parse mode
-                logger.warning(f"Markdown parsing failed for OKR message: {parse_error}. Sending without parse mode.")
-                clean_okr_message = okr_message.replace('**', '').replace('*', '')
-                if reply_markup:
-                    self.updater.bot.send_message(
-                        chat_id=TELEGRAM_GROUP_CHAT_ID,
-                        text=clean_okr_message,
-                        reply_markup=reply_markup
+                except Exception as parse_error:
+                    # If Markdown parsing fails, send without parse mode
+                    logger.warning(f"Markdown parsing failed for EOD message: {parse_error}. Sending without parse mode.")
+                    self._broadcast(
+                        text.translate(STRIP_BOLD),
+                        reply_markup=markup
                     )
-                else:
-                    self.updater.bot.send_message(
-                        chat_id=TELEGRAM_GROUP_CHAT_ID,
-                        text=clean_okr_message
-                    )
-                logger.info("Sent OKR message without parse mode")
-                
+            logger.info("Sent end-of-day summary and OKR prompt in %s message(s)", len(messages))
+
             logger.info("End-of-day summary process completed successfully")
         except Exception as e:
             logger.error(f"Error sending end-of-day summary: {e}")
             # Try to send an error notification to the group
             try:
-                self.updater.bot.send_message(
-                    chat_id=TELEGRAM_GROUP_CHAT_ID,
-                    text="⚠️ There was an error sending the end-of-day summary. Please check the logs."
+                self._broadcast(
+                    "⚠️ There was an error sending the end-of-day summary. Please check the logs."
                 )
             except:
                 pass  # Silently fail if we can't send the error message
     
     def error_handler(self, update, context):
         """Log errors caused by updates."""
-        logger.error(f"Update {update} caused error {context.error}")
+        logger.error("Update %s caused error %s", update, context.error)
         
         # Notify users of the error
         if update and update.effective_chat:
-            context.bot.send_message(
-                chat_id=update.effective_chat.id,
-                text="Sorry, something went wrong. Please try again later."
+            self._safe_send(
+                update.effective_chat.id,
+                "Sorry, something went wrong. Please try again later."
             )
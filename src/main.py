@@ -1,21 +1,87 @@
 #!/usr/bin/env python3
+import atexit
+import ipaddress
 import logging
 import os
+import queue
+import re
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from urllib.parse import urlparse
 os.makedirs("logs", exist_ok=True)
 from dotenv import load_dotenv
 from bot import InternBot
 
-# Configure logging
+# Configure logging. Handlers only put records on a queue; a background
+# listener thread formats them and writes them to the log file and stderr.
+# The file rolls over at 5 MB, keeping five old copies
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [
+    RotatingFileHandler("logs/bot.log", maxBytes=5_000_000, backupCount=5),
+    logging.StreamHandler()
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+
+# The queue handler only merges the message with its arguments; the
+# listener's handlers add the timestamp and level
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
+# force replaces the handler bot.py's own basicConfig installed on import
 logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     level=logging.INFO,
-    handlers=[
-        logging.FileHandler("logs/bot.log"),
-        logging.StreamHandler()
-    ]
+    handlers=[queue_handler],
+    force=True
 )
+log_listener.start()
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
+# Characters allowed in a custom WEBHOOK_PATH
+WEBHOOK_PATH_PATTERN = re.compile(r'[\w.~:-]+')
+
+def check_webhook_settings():
+    """
+    Check the settings used when MODE=webhook, logging each problem found.
+    
+    Returns:
+        bool: True if the bot can start with these settings
+    """
+    webhook_url = os.getenv('WEBHOOK_URL')
+    if not webhook_url:
+        logger.warning("MODE=webhook but WEBHOOK_URL is not set; the bot will fall back to polling.")
+    else:
+        # Telegram only delivers webhooks over HTTPS
+        parsed_url = urlparse(webhook_url)
+        if parsed_url.scheme != 'https' or not parsed_url.netloc:
+            logger.error("Invalid WEBHOOK_URL '%s'; use the public https:// URL of this host.", webhook_url)
+            return False
+    
+    port = os.getenv('PORT', '8443')
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        logger.error("Invalid PORT '%s'; use a port number from 1 to 65535.", port)
+        return False
+    
+    listen = os.getenv('WEBHOOK_LISTEN', '0.0.0.0')
+    try:
+        ipaddress.ip_address(listen)
+    except ValueError:
+        logger.error("Invalid WEBHOOK_LISTEN '%s'; use an IP address such as 0.0.0.0.", listen)
+        return False
+    
+    # The path defaults to the bot token; a custom one must be a single URL segment
+    webhook_path = os.getenv('WEBHOOK_PATH')
+    if webhook_path is not None and not WEBHOOK_PATH_PATTERN.fullmatch(webhook_path):
+        logger.error(
+            "Invalid WEBHOOK_PATH '%s'; use letters, digits and _ - . ~ : only.", webhook_path
+        )
+        return False
+    
+    return True
+
 def main():
     """Main function to start the bot."""
     # Load environment variables
@@ -36,6 +102,23 @@ def main():
         logger.error("Please set them in the .env file.")
         return
     
+    # The group chat ID is a number, e.g. -1001234567890 for a supergroup
+    group_chat_id = os.getenv('TELEGRAM_GROUP_CHAT_ID')
+    try:
+        int(group_chat_id)
+    except ValueError:
+        logger.error("Invalid TELEGRAM_GROUP_CHAT_ID '%s'; it must be a numeric chat ID.", group_chat_id)
+        logger.error("Run get_chat_id.py to look it up.")
+        return
+    
+    # Check the update delivery settings
+    mode = os.getenv('MODE', 'polling').lower()
+    if mode not in ('polling', 'webhook'):
+        logger.error("Invalid MODE '%s'; use 'polling' or 'webhook'.", mode)
+        return
+    if mode == 'webhook' and not check_webhook_settings():
+        return
+    
     # Check for test mode flag
     import sys
     test_mode = '--test' in sys.argv
@@ -18,6 +18,8 @@ class OKRManager:
         """
         self.sheets_manager = sheets_manager
         self.active_okrs = []
+        self._okr_by_id = {}
+        self._cached_keyboard = None
         self.sync_okrs()
     
     def sync_okrs(self):
@@ -38,28 +40,45 @@ class OKRManager:
         
         # Debug: Print all column names from the first OKR
         if all_okrs:
-            logger.info(f"Available columns in OKR sheet: {list(all_okrs[0].keys())}")
-            for okr in all_okrs:
-                logger.info(f"OKR data: {okr}")
+            logger.debug("Available columns in OKR sheet: %s", list(all_okrs[0]))
         else:
             logger.warning("No OKRs found in the sheet")
         
         # Filter for active OKRs (current date is between start and end date)
         today = datetime.now(IST_TIMEZONE).date()
         
-        self.active_okrs = []
+        # Build the list before replacing it, so handlers on other threads
+        # never see a half-synced list
+        active_okrs = []
         for okr in all_okrs:
             try:
                 start_date = datetime.strptime(okr['Period_Start_Date'], '%Y-%m-%d').date()
                 end_date = datetime.strptime(okr['Period_End_Date'], '%Y-%m-%d').date()
                 
                 if start_date <= today <= end_date:
-                    self.active_okrs.append(okr)
+                    # Keep the parsed dates so progress feedback doesn't re-parse them
+                    okr['_start_date'] = start_date
+                    okr['_end_date'] = end_date
+                    okr['_total_days'] = (end_date - start_date).days
+                    # Progress needed per day to hit the target; None when the
+                    # period is a single day or the values aren't numbers
+                    okr['_required_daily_change'] = None
+                    if okr['_total_days'] > 0:
+                        try:
+                            total_required_change = float(okr['Target_Value']) - float(okr['Start_Value'])
+                            okr['_required_daily_change'] = total_required_change / okr['_total_days']
+                        except (ValueError, TypeError, KeyError):
+                            pass
+                    active_okrs.append(okr)
             except (ValueError, KeyError):
                 # Skip OKRs with invalid date formats
                 logger.warning(f"Skipping OKR with invalid date format: {okr.get('Goal_Name', 'Unknown')}")
                 continue
         
+        self.active_okrs = active_okrs
+        self._okr_by_id = {okr['OKR_ID']: okr for okr in active_okrs}
+        # The keyboard lists the active OKRs, so rebuild it on next use
+        self._cached_keyboard = None
         logger.info(f"Found {len(self.active_okrs)} active OKRs")
         return True
     
@@ -70,6 +89,9 @@ class OKRManager:
         Returns:
             tuple: (message_text, inline_keyboard_markup)
         """
+        if self._cached_keyboard:
+            return self._cached_keyboard
+        
         if not self.active_okrs:
             return "No active OKRs found. Use /syncokrs to refresh from the sheet.", None
         
@@ -92,7 +114,8 @@ class OKRManager:
                 )
             ])
         
-        return message, InlineKeyboardMarkup(keyboard)
+        self._cached_keyboard = message, InlineKeyboardMarkup(keyboard)
+        return self._cached_keyboard
     
     def generate_okr_summary(self):
         """
@@ -129,11 +152,6 @@ class OKRManager:
                 target_value = okr.get('Target_Value', '0')
                 start_value = okr.get('Start_Value', '0')
                 
-                # Log the values for debugging
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.info(f"OKR values - Goal: {goal_name}, Start: {start_value}, Current: {current_value}, Target: {target_value}")
-                
                 # Calculate progress percentage based on the difference between current and start values
                 # relative to the difference between target and start values
                 try:
@@ -164,6 +182,7 @@ class OKRManager:
         summary += f"_Last updated: {now}_"
         
         logger.info("Generated OKR summary")
+        logger.debug("OKR summary covers %s OKRs for %s owners", len(self.active_okrs), len(okrs_by_owner))
         return summary
     
     def get_okr_by_id(self, okr_id):
@@ -176,10 +195,7 @@ class OKRManager:
         Returns:
             dict: OKR data or None if not found
         """
-        for okr in self.active_okrs:
-            if okr['OKR_ID'] == okr_id:
-                return okr
-        return None
+        return self._okr_by_id.get(okr_id)
     
     def calculate_progress_feedback(self, okr, new_value):
         """
@@ -199,12 +215,11 @@ class OKRManager:
             current_value = float(new_value)
             
             # Calculate dates
-            start_date = datetime.strptime(okr['Period_Start_Date'], '%Y-%m-%d').date()
-            end_date = datetime.strptime(okr['Period_End_Date'], '%Y-%m-%d').date()
+            start_date = okr['_start_date']
+            end_date = okr['_end_date']
             today = datetime.now(IST_TIMEZONE).date()
             
             # Calculate progress
-            total_days = (end_date - start_date).days
             days_passed = (today - start_date).days
             days_remaining = (end_date - today).days
             
@@ -215,18 +230,19 @@ class OKRManager:
             okr_progress = self.sheets_manager.get_okr_progress(okr['Goal_Name'])
             
             if okr_progress:
-                # Sort by date (most recent first)
-                okr_progress.sort(key=lambda x: x['Date'], reverse=True)
-                prev_value = float(okr_progress[0]['Updated_Value'])
+                # Use the most recent update
+                latest = max(okr_progress, key=lambda x: x['Date'])
+                prev_value = float(latest['Updated_Value'])
                 daily_change = current_value - prev_value
             else:
                 # If no previous updates, compare with start value
                 prev_value = start_value
                 daily_change = current_value - prev_value
             
-            # Calculate required daily progress
-            total_required_change = target_value - start_value
-            required_daily_change = total_required_change / total_days
+            # Required daily progress, worked out when the OKRs were synced
+            required_daily_change = okr['_required_daily_change']
+            if required_daily_change is None:
+                return f"Progress updated for '{okr['Goal_Name']}'. New value: {new_value}"
             
             # Calculate today's target
             expected_progress = start_value + (required_daily_change * days_passed)
@@ -262,7 +278,7 @@ class OKRManager:
             
             return feedback
             
-        except (ValueError, KeyError, ZeroDivisionError):
+        except (ValueError, KeyError):
             # Fallback for any calculation errors
             return f"Progress updated for '{okr['Goal_Name']}'. New value: {new_value}"
     
@@ -3,6 +3,8 @@ from oauth2client.service_account import ServiceAccountCredentials
 from datetime import datetime
 import uuid
 import os
+import threading
+import time
 import pytz
 from dotenv import load_dotenv
 
@@ -24,6 +26,9 @@ DAILY_PROGRESS_LOG_SHEET = 'Daily_Progress_Log'
 # Define timezone
 IST_TIMEZONE = pytz.timezone('Asia/Kolkata')
 
+# How long cached Task_Log records are reused before re-fetching (seconds)
+TASK_CACHE_TTL = 60
+
 class SheetsManager:
     """
     Handles all interactions with Google Sheets API for the InternBot.
@@ -48,6 +53,13 @@ class SheetsManager:
         self.okr_log = self.spreadsheet.worksheet(OKR_LOG_SHEET)
         self.daily_progress_log = self.spreadsheet.worksheet(DAILY_PROGRESS_LOG_SHEET)
         
+        # Cached Task_Log records and when they were fetched
+        self._task_cache = None
+        self._tasks_by_id = {}
+        self._task_rows = {}
+        self._task_cache_time = 0.0
+        self._task_cache_lock = threading.Lock()
+        
         # Initialize worksheets if they don't exist or are empty
         self._initialize_worksheets()
     
@@ -82,6 +94,44 @@ class SheetsManager:
         if not self.daily_progress_log.get_all_values():
             self.daily_progress_log.append_row(progress_headers)
     
+    def get_all_tasks(self):
+        """
+        Get all Task_Log records, reusing the last fetch if it is recent.
+        
+        Returns:
+            list: All task records, at most TASK_CACHE_TTL seconds old
+        """
+        # Handlers run on several threads; only one of them re-fetches a stale cache
+        with self._task_cache_lock:
+            if self._task_cache is None or time.monotonic() - self._task_cache_time > TASK_CACHE_TTL:
+                self._set_task_cache(self.task_log.get_all_records())
+            return self._task_cache
+    
+    def get_task_by_id(self, task_id):
+        """
+        Get a single task by its ID using the cached records.
+        
+        Args:
+            task_id (str): ID of the task
+        
+        Returns:
+            dict: Task record or None if not found
+        """
+        self.get_all_tasks()
+        return self._tasks_by_id.get(task_id)
+    
+    def _set_task_cache(self, records):
+        """Store freshly fetched Task_Log records in the cache, indexed by Task_ID."""
+        self._task_cache = records
+        self._tasks_by_id = {str(task['Task_ID']): task for task in records}
+        # Sheet row of each task; records start on row 2, below the header
+        self._task_rows = {str(task['Task_ID']): row for row, task in enumerate(records, start=2)}
+        self._task_cache_time = time.monotonic()
+    
+    def invalidate_task_cache(self):
+        """Drop the cached Task_Log records so the next read re-fetches them."""
+        self._task_cache = None
+    
     def add_task(self, task_description, assigned_to, priority, category="General", due_date=None):
         """
         Add a new task to the Task_Log sheet.
@@ -117,6 +167,7 @@ class SheetsManager:
         
         # Append the new task to the sheet
         self.task_log.append_row(row_data)
+        self.invalidate_task_cache()
         
         return task_id
     
@@ -134,15 +185,15 @@ class SheetsManager:
         try:
             # Log the request for debugging
             import logging
-            logging.info(f"Getting {status} tasks for user: {username}")
+            logger = logging.getLogger(__name__)
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("Getting %s tasks for user: %s", status, username)
             
             # Get all tasks
             all_tasks = self.task_log.get_all_records()
-            logging.info(f"Total tasks in sheet: {all_tasks}")
-            
-            # Get column headers to understand the data structure
-            headers = self.task_log.row_values(1)
-            logging.info(f"Sheet headers: {headers}")
+            if debug:
+                logger.debug("Total tasks in sheet: %s", len(all_tasks))
             
             # Filter tasks by username and status and ensure all required keys exist
             user_tasks = []
@@ -152,7 +203,8 @@ class SheetsManager:
                 try:
                     # Check if this task belongs to the user and has the right status
                     if task.get('Assigned_To_User') == username and task.get('Status') == status:
-                        logging.info(f"Found task for {username}: {task}")
+                        if debug:
+                            logger.debug("Found task for %s: %s", username, task)
                         # Create a clean task with all required keys and default values
                         clean_task = {
                             'Task_ID': task.get('Task_ID', f"unknown_{len(user_tasks)}"),
@@ -170,7 +222,8 @@ class SheetsManager:
                     logging.error(f"Error processing task: {e}. Task: {task}")
                     continue
             
-            logging.info(f"Found {len(user_tasks)} {status} tasks for {username}")
+            if debug:
+                logger.debug("Found %s %s tasks for %s", len(user_tasks), status, username)
             return user_tasks
             
         except Exception as e:
@@ -187,21 +240,15 @@ class SheetsManager:
         """
         try:
             import logging
-            logging.info("Getting all open tasks")
+            logger = logging.getLogger(__name__)
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("Getting all open tasks")
             
             # Get all tasks
             all_tasks = self.task_log.get_all_records()
-            logging.info(f"Total tasks in sheet: {len(all_tasks)}")
-            
-            # Debug: Log the column headers
-            headers = self.task_log.get_all_values()[0] if self.task_log.get_all_values() else []
-            logging.info(f"Sheet headers: {headers}")
-            
-            # Debug: Log a few tasks to see the raw data
-            for i, task in enumerate(all_tasks[:3]):
-                logging.info(f"Raw task {i+1} data: {task}")
-                logging.info(f"Priority in raw data: '{task.get('Priority', 'NOT_FOUND')}'")
-
+            if debug:
+                logger.debug("Total tasks in sheet: %s", len(all_tasks))
             
             # Filter tasks by status and ensure all required keys exist
             open_tasks = []
@@ -210,10 +257,6 @@ class SheetsManager:
                 try:
                     # Check if this task has 'Open' status
                     if task.get('Status') == 'Open':
-                        # Debug: Log the raw priority value
-                        raw_priority = task.get('Priority', 'NOT_FOUND')
-                        logging.info(f"Task: {task.get('Task_Description')} - Raw Priority: '{raw_priority}'")
-                        
                         # Create a clean task with all required keys and default values
                         username = task.get('Assigned_To_User', 'unassigned')
                         clean_task = {
@@ -227,19 +270,14 @@ class SheetsManager:
                             'Date_Completed': task.get('Date_Completed', ''),
                             'Due_Date': task.get('Due_Date', '')
                         }
-                        
-                        # Debug: Log the clean task priority
-                        logging.info(f"Clean task priority: '{clean_task['Priority']}'")
                         open_tasks.append(clean_task)
                 except Exception as e:
                     logging.error(f"Error processing task: {e}. Task: {task}")
                     continue
             
-            logging.info(f"Found {len(open_tasks)} open tasks")
-            
-            # Debug: Log priorities of all open tasks
-            priorities = [task.get('Priority', 'NONE') for task in open_tasks]
-            logging.info(f"All task priorities: {priorities}")
+            if debug:
+                logger.debug("Found %s open tasks with priorities %s",
+                             len(open_tasks), [task['Priority'] for task in open_tasks])
             
             return open_tasks
             
@@ -264,15 +302,12 @@ class SheetsManager:
         
         logger.info(f"SheetsManager: Marking task {task_id} as done in Google Sheets")
         
-        # Find the task row
-        all_tasks = self.task_log.get_all_records()
-        task_row = None
-        
-        for i, task in enumerate(all_tasks):
-            if task['Task_ID'] == task_id:
-                # Add 2 to account for header row and 0-indexing
-                task_row = i + 2
-                break
+        # Fetch fresh records so the row number is current, and find the task's
+        # row and record; the lock keeps a concurrent refresh from interleaving
+        with self._task_cache_lock:
+            self._set_task_cache(self.task_log.get_all_records())
+            task_row = self._task_rows.get(str(task_id))
+            task = self._tasks_by_id.get(str(task_id))
         
         if task_row:
             # Update the status to 'Done'
@@ -304,6 +339,19 @@ class SheetsManager:
                 self.task_log.update_cell(task_row, completion_link_col, completion_link)
                 logger.info(f"Completion link stored successfully for task {task_id}")
             
+            # Update the cached record to match the sheet, so the follow-up
+            # lookup of this task doesn't fetch the records again. If another
+            # thread refreshed the cache meanwhile, drop it instead, since the
+            # refresh may have read the row before these updates
+            with self._task_cache_lock:
+                if self._tasks_by_id.get(str(task_id)) is task:
+                    task['Status'] = 'Done'
+                    task['Date_Completed'] = completion_date
+                    if completion_link:
+                        task['Completion_Link'] = completion_link
+                else:
+                    self.invalidate_task_cache()
+            
             return True
         
         return False
@@ -1,18 +1,24 @@
 import re
+from types import MappingProxyType
 from datetime import datetime
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 import pytz
 
-# Define task priorities
-TASK_PRIORITIES = {
+# Define task priorities (read-only)
+TASK_PRIORITIES = MappingProxyType({
     'P1': '🔴',  # High priority
     'P2': '🟡',  # Medium priority
     'P3': '🔵',  # Low priority
-}
+})
 
 # Define timezone
 IST_TIMEZONE = pytz.timezone('Asia/Kolkata')
 
+# Compiled patterns for the parts of a /task command
+DUE_DATE_PATTERN = re.compile(r'-d\s+(\d{4}-\d{2}-\d{2})')
+ASSIGNEE_PATTERN = re.compile(r'-a\s+([\w_]+)')
+TASK_PATTERN = re.compile(r'^(P[123])\s+(.+?)(?:\s+-c\s+(.+))?$')
+
 class TaskManager:
     """
     Handles all task-related operations for the InternBot.
@@ -47,25 +53,25 @@ class TaskManager:
         
         # Extract due date if present
         due_date = None
-        due_date_match = re.search(r'-d\s+(\d{4}-\d{2}-\d{2})', text)
+        due_date_match = DUE_DATE_PATTERN.search(text)
         if due_date_match:
             due_date = due_date_match.group(1)
             # Remove the due date part from the text
-            text = re.sub(r'-d\s+\d{4}-\d{2}-\d{2}', '', text).strip()
+            text = DUE_DATE_PATTERN.sub('', text).strip()
         
         # Extract assignee if present
         assignee = None
-        assignee_match = re.search(r'-a\s+([\w_]+)', text)
+        assignee_match = ASSIGNEE_PATTERN.search(text)
         if assignee_match:
             assignee = assignee_match.group(1)
             logger.info(f"Assignee found: {assignee}")
             # Remove the assignee part from the text
-            text = re.sub(r'-a\s+[\w_]+', '', text).strip()
+            text = ASSIGNEE_PATTERN.sub('', text).strip()
         else:
             logger.info("No assignee specified in command")
         
         # Check if the text starts with a valid priority
-        priority_match = re.match(r'^(P[123])\s+(.+?)(?:\s+-c\s+(.+))?$', text)
+        priority_match = TASK_PATTERN.match(text)
         
         if not priority_match:
             return None
@@ -121,22 +127,22 @@ class TaskManager:
         try:
             import logging
             # Validate username
-            logging.info(f"DEBUG - Getting tasks for username: {username}")
+            logging.debug("Getting tasks for username: %s", username)
             if not username or not isinstance(username, str):
                 logging.warning(f"DEBUG - Invalid username: {username}")
                 return f"Invalid username: {username}. Please set a username in your Telegram settings.", None
             
             # Get all open tasks for the user
             tasks = self.sheets_manager.get_user_tasks(username, status='Open')
-            logging.info(f"DEBUG - Retrieved {len(tasks)} tasks for {username}")
+            logging.debug("Retrieved %s tasks for %s", len(tasks), username)
             
             if not tasks:
-                logging.info(f"DEBUG - No open tasks found for {username}")
+                logging.debug("No open tasks found for %s", username)
                 return f"You (@{username}) have no open tasks.", None
             
             # Create message text
             message = f"📋 Tasks for @{username}\n\n"  # Removed * formatting but kept emoji
-            logging.info(f"DEBUG - Starting message: {message}")
+            logging.debug("Starting message: %s", message)
             
             # Create inline keyboard buttons
             keyboard = []
@@ -156,14 +162,14 @@ class TaskManager:
                 category = task.get('Category', 'General')
                 due_date = task.get('Due_Date', '')
                 
-                logging.info(f"DEBUG - Processing task: ID={task_id}, Priority={priority}, Desc={description[:20]}...")
+                logging.debug("Processing task: ID=%s, Priority=%s, Desc=%s...", task_id, priority, description[:20])
                 
                 # Add to sorted list with priority and due date
                 sorted_tasks.append((priority, task_id, description, category, due_date))
         
             # Sort by priority
             sorted_tasks.sort(key=lambda x: x[0])
-            logging.info(f"DEBUG - Sorted {len(sorted_tasks)} tasks by priority")
+            logging.debug("Sorted %s tasks by priority", len(sorted_tasks))
         
             # Process sorted tasks
             for priority, task_id, description, category, due_date in sorted_tasks:
@@ -181,7 +187,7 @@ class TaskManager:
                 message += f"• {priority_emoji} {task_text} ({category}){due_date_text}\n"
                 
                 # Log the priority and emoji for debugging
-                logging.info(f"DEBUG - Added task to message: {priority_emoji} {task_text[:20]}... ({category})")
+                logging.debug("Added task to message: %s %s... (%s)", priority_emoji, task_text[:20], category)
                 
                 # Truncate description if too long
                 if len(description) > 20:
@@ -196,9 +202,9 @@ class TaskManager:
                     )
                 ])
             
-            logging.info(f"DEBUG - Final message length: {len(message)} characters")
-            logging.info(f"DEBUG - First 100 chars of message: {message[:100]}...")
-            logging.info(f"DEBUG - Created {len(keyboard)} keyboard buttons")
+            logging.debug("Final message length: %s characters", len(message))
+            logging.debug("First 100 chars of message: %s...", message[:100])
+            logging.debug("Created %s keyboard buttons", len(keyboard))
             
             return message, InlineKeyboardMarkup(keyboard)
             
@@ -221,22 +227,22 @@ class TaskManager:
             import logging
             from datetime import datetime
             
-            logging.info("DEBUG - Getting tasks sorted by due date")
+            logging.debug("Getting tasks sorted by due date")
             
             # Get all open tasks
             tasks = self.sheets_manager.get_all_open_tasks()
-            logging.info(f"DEBUG - Retrieved {len(tasks)} total tasks")
+            logging.debug("Retrieved %s total tasks", len(tasks))
             
             if not tasks:
-                logging.info("DEBUG - No open tasks found")
+                logging.debug("No open tasks found")
                 return "There are no open tasks with due dates.", None
         
             # Filter tasks with due dates and sort them
             due_tasks = [task for task in tasks if task.get('Due_Date')]
-            logging.info(f"DEBUG - Found {len(due_tasks)} tasks with due dates")
+            logging.debug("Found %s tasks with due dates", len(due_tasks))
             
             if not due_tasks:
-                logging.info("DEBUG - No tasks with due dates set")
+                logging.debug("No tasks with due dates set")
                 return "There are no tasks with due dates set.", None
         
             # Sort tasks by due date (closest first)
@@ -246,7 +252,7 @@ class TaskManager:
                     if task['Due_Date']:
                         try:
                             task['_due_date_obj'] = datetime.strptime(task['Due_Date'], '%Y-%m-%d')
-                            logging.info(f"DEBUG - Parsed date {task['Due_Date']} for task {task.get('Task_ID')}")
+                            logging.debug("Parsed date %s for task %s", task['Due_Date'], task.get('Task_ID'))
                         except ValueError as ve:
                             logging.error(f"DEBUG - Date parsing error for {task['Due_Date']}: {ve}")
                             task['_due_date_obj'] = datetime.max  # Far future for invalid dates
@@ -255,7 +261,7 @@ class TaskManager:
                 
                 # Sort by due date
                 due_tasks.sort(key=lambda x: x['_due_date_obj'])
-                logging.info("DEBUG - Successfully sorted tasks by due date")
+                logging.debug("Successfully sorted tasks by due date")
             except Exception as e:
                 logging.error(f"Error sorting tasks by due date: {str(e)}")
                 logging.error(f"Error details: {type(e).__name__}, {e.__traceback__.tb_lineno}")
@@ -263,7 +269,7 @@ class TaskManager:
         
             # Create message text - removed asterisks to avoid Markdown parsing issues
             message = "📅 Tasks By Due Date\n\n"
-            logging.info(f"DEBUG - Starting message: {message}")
+            logging.debug("Starting message: %s", message)
             
             # Create inline keyboard buttons
             keyboard = []
@@ -277,7 +283,7 @@ class TaskManager:
                 if due_date != current_date:
                     current_date = due_date
                     message += f"\nDue: {due_date}\n"
-                    logging.info(f"DEBUG - Added date header for {due_date}")
+                    logging.debug("Added date header for %s", due_date)
                 
                 # Get task details
                 username = task.get('Assigned_To_User', 'unassigned')
@@ -286,7 +292,7 @@ class TaskManager:
                 category = task.get('Category', 'General')
                 task_id = task.get('Task_ID', 'unknown')
                 
-                logging.info(f"DEBUG - Processing task: ID={task_id}, Priority={priority}, User={username}")
+                logging.debug("Processing task: ID=%s, Priority=%s, User=%s", task_id, priority, username)
                 
                 # Get the correct priority emoji based on the task's priority
                 priority_emoji = TASK_PRIORITIES.get(priority, '⚪')
@@ -299,7 +305,7 @@ class TaskManager:
                 message += f"• {priority_emoji} {task_text} (@{username}) ({category})\n"
             
                 # Log the priority and emoji for debugging
-                logging.info(f"DEBUG - Added task to message: {priority_emoji} {task_text[:20]}... (@{username})")
+                logging.debug("Added task to message: %s %s... (@%s)", priority_emoji, task_text[:20], username)
                 
                 # Truncate description if too long
                 if len(description) > 15:
@@ -315,9 +321,9 @@ class TaskManager:
                     )
                 ])
             
-            logging.info(f"DEBUG - Final message length: {len(message)} characters")
-            logging.info(f"DEBUG - First 100 chars of message: {message[:100]}...")
-            logging.info(f"DEBUG - Created {len(keyboard)} keyboard buttons")
+            logging.debug("Final message length: %s characters", len(message))
+            logging.debug("First 100 chars of message: %s...", message[:100])
+            logging.debug("Created %s keyboard buttons", len(keyboard))
             
             return message, InlineKeyboardMarkup(keyboard)
             
@@ -380,15 +386,14 @@ class TaskManager:
             sorted_users = sorted(user_tasks.keys())
             logging.info(f"Found {len(tasks)} open tasks for {len(sorted_users)} users")
             
-            # Create message text - use double asterisks for better Markdown compatibility
-            message = "**All Open Tasks**\n\n"
+            # Create message text - plain text, callers send it without a parse mode
+            message = "All Open Tasks\n\n"
             
             # Create inline keyboard buttons
             keyboard = []
             
             for username in sorted_users:
-                # Use double asterisks for better Markdown compatibility
-                message += f"\n**@{username}**:\n"
+                message += f"\n@{username}:\n"
                 
                 # Sort tasks by priority (P1 first)
                 user_tasks[username].sort(key=lambda x: x['Priority'])
@@ -560,14 +565,14 @@ class TaskManager:
         # Get today's date in IST
         today = datetime.now(IST_TIMEZONE).strftime('%Y-%m-%d')
         
-        # Get all tasks
-        all_tasks = self.sheets_manager.task_log.get_all_records()
+        # Get all tasks (served from the sheets manager's cache when fresh)
+        all_tasks = self.sheets_manager.get_all_tasks()
         
-        # Find users who have added tasks today
-        users_with_tasks = set()
-        for task in all_tasks:
-            if task['Date_Created'].startswith(today) and task['Assigned_To_User'] in user_list:
-                users_with_tasks.add(task['Assigned_To_User'])
+        # Find users who have added tasks today in one pass over the sheet
+        users_with_tasks = {
+            task['Assigned_To_User'] for task in all_tasks
+            if task['Date_Created'].startswith(today)
+        }
         
         # Return users who haven't added tasks
         return [user for user in user_list if user not in users_with_tasks]
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# bot.py reads these at import
+os.environ.setdefault('TELEGRAM_BOT_TOKEN', '123456:ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghi')
+os.environ.setdefault('TELEGRAM_GROUP_CHAT_ID', '-100123')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from telegram import Update
+
+import bot
+
+GROUP_CHAT = {'id': int(os.environ['TELEGRAM_GROUP_CHAT_ID']), 'type': 'supergroup', 'title': 'Team'}
+USER = {'id': 42, 'is_bot': False, 'first_name': 'Intern', 'username': 'intern'}
+
+class TaskPromptPersistenceTest(unittest.TestCase):
+    """The link prompt survives restarts without breaking the state file."""
+
+    def setUp(self):
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        patches = [
+            mock.patch.object(bot, 'STATE_FILE', os.path.join(state_dir.name, 'bot_state.pkl')),
+            mock.patch.object(bot, 'SheetsManager'),
+            mock.patch.object(bot.InternBot, 'error_handler')
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        sheets_manager = bot.SheetsManager.return_value
+        sheets_manager.get_all_okrs.return_value = []
+        sheets_manager.get_task_by_id.return_value = {'Task_Description': 'Write the weekly report'}
+        self.error_handler = bot.InternBot.error_handler
+
+    def start_bot(self):
+        """Build an InternBot whose Telegram API calls are recorded instead of sent."""
+        intern_bot = bot.InternBot()
+        api = mock.MagicMock()
+        for method in ('send_message', 'answer_callback_query'):
+            patch = mock.patch.object(type(intern_bot.updater.bot), method, api)
+            patch.start()
+            self.addCleanup(patch.stop)
+        intern_bot.task_manager = mock.MagicMock()
+        intern_bot.task_manager.mark_task_as_done.return_value = True
+        return intern_bot, api
+
+    def send(self, intern_bot, update_id, **fields):
+        """Run one update through the dispatcher on this thread."""
+        data = {'update_id': update_id, **fields}
+        intern_bot.dispatcher.process_update(Update.de_json(data, intern_bot.updater.bot))
+
+    def click_add_link(self, intern_bot):
+        self.send(intern_bot, 1, callback_query={
+            'id': '1', 'from': USER, 'chat_instance': 'team', 'data': 'addlink:t1',
+            'message': {'message_id': 10, 'date': 0, 'chat': GROUP_CHAT,
+                        'text': 'How would you like to complete this task?'}
+        })
+
+    def reply_with_link(self, intern_bot):
+        self.send(intern_bot, 2, message={
+            'message_id': 11, 'date': 0, 'chat': GROUP_CHAT, 'from': USER,
+            'text': 'https://example.com/report'
+        })
+
+    def test_link_reply_then_restart(self):
+        intern_bot, api = self.start_bot()
+        self.click_add_link(intern_bot)
+        self.reply_with_link(intern_bot)
+
+        self.error_handler.assert_not_called()
+        intern_bot.task_manager.mark_task_as_done.assert_called_once_with('t1', 'https://example.com/report')
+        self.assertIn('Task completed successfully', api.call_args.kwargs['text'])
+
+        # The state file must still load
+        self.start_bot()
+
+    def test_link_prompt_survives_restart(self):
+        intern_bot, _ = self.start_bot()
+        self.click_add_link(intern_bot)
+
+        intern_bot, _ = self.start_bot()
+        self.reply_with_link(intern_bot)
+
+        self.error_handler.assert_not_called()
+        intern_bot.task_manager.mark_task_as_done.assert_called_once_with('t1', 'https://example.com/report')
+
+if __name__ == '__main__':
+    unittest.main()